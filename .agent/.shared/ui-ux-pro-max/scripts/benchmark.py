@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - latency and memory regression harness for the search engine
+Usage: python benchmark.py [--iterations 20] [--save baseline.json]
+       python benchmark.py --compare baseline.json [--threshold 0.25]
+       python benchmark.py --startup [--budget 100]
+
+Measures, over a fixed query corpus covering every domain and stack:
+  - cold latency (in-memory cache cleared, indexes loaded from data/.index/)
+  - warm latency (indexes resident)
+  - per-phase timings per dataset: CSV load, BM25 fit, score, format
+  - generate_design_system cold/warm latency
+  - peak traced memory of a full cold run
+  - startup of a plain `search.py` query (`python -X importtime`)
+Comparing against a saved baseline flags every metric slower than
+baseline * (1 + threshold) and exits with status 1. --startup only checks
+the plain-search import time against its budget and that none of the
+lazily loaded modules were imported; it exits with status 1 on failure.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import core
+from core import CSV_CONFIG, STACK_CONFIG, _STACK_COLS, DATA_DIR, search, search_stack
+from design_system import DesignSystemGenerator, format_ascii_box
+from search import format_output
+
+# ============ QUERY CORPUS ============
+DOMAIN_QUERIES = {
+    "style": ["glassmorphism dark mode", "minimalism clean", "brutalism bold"],
+    "prompt": ["css variables tailwind", "implementation checklist"],
+    "color": ["fintech trust blue", "healthcare calm"],
+    "chart": ["trend over time", "pie chart comparison"],
+    "landing": ["hero pricing cta", "testimonial conversion"],
+    "product": ["saas dashboard", "e-commerce luxury"],
+    "ux": ["animation accessibility", "touch target mobile"],
+    "typography": ["elegant luxury serif", "modern sans geometric"],
+    "icons": ["lucide navigation", "social media icons"],
+    "react": ["memo rerender", "bundle waterfall suspense"],
+    "web": ["form focus aria", "autocomplete input type"],
+}
+STACK_QUERIES = ["state management", "responsive layout form", "performance images"]
+DESIGN_SYSTEM_QUERIES = ["SaaS dashboard", "beauty spa wellness service", "fintech crypto"]
+
+STARTUP_COMMAND = ["search.py", "glassmorphism dark mode", "--domain", "style"]
+STARTUP_BUDGET_MS = 100  # total import time of the plain-search path (eager NumPy alone costs ~80 ms)
+LAZY_MODULES = ("design_system", "numpy", "csv", "hashlib", "socketserver", "concurrent.futures")
+
+
+def _workload():
+    """(label, callable) for every query in the corpus"""
+    calls = []
+    for domain, queries in DOMAIN_QUERIES.items():
+        for query in queries:
+            calls.append((f"{domain}:{query}", lambda q=query, d=domain: search(q, d)))
+    for stack in STACK_CONFIG:
+        for query in STACK_QUERIES:
+            calls.append((f"stack:{stack}:{query}", lambda q=query, s=stack: search_stack(q, s)))
+    return calls
+
+
+# ============ MEASUREMENT ============
+def _percentiles(samples):
+    """p50/p90/p99/max in milliseconds"""
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))] * 1000
+
+    return {"p50_ms": round(pick(0.50), 4), "p90_ms": round(pick(0.90), 4),
+            "p99_ms": round(pick(0.99), 4), "max_ms": round(ordered[-1] * 1000, 4)}
+
+
+def _time(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_queries(iterations):
+    """Cold and warm latency over the whole query corpus"""
+    calls = _workload()
+    cold, warm = [], []
+    for _ in range(iterations):
+        for _, fn in calls:
+            core.clear_cache()
+            cold.append(_time(fn))
+        for _, fn in calls:
+            fn()  # warm-up: the cold loop left only the last dataset resident
+        for _, fn in calls:
+            warm.append(_time(fn))
+    return {"queries": len(calls), "cold": _percentiles(cold), "warm": _percentiles(warm)}
+
+
+def bench_design_system(iterations):
+    """Cold and warm latency of a full design-system generation"""
+    cold, warm = [], []
+    for _ in range(iterations):
+        for query in DESIGN_SYSTEM_QUERIES:
+            core.clear_cache()
+            cold.append(_time(lambda: DesignSystemGenerator().generate(query)))
+            warm.append(_time(lambda: DesignSystemGenerator().generate(query)))
+    return {"cold": _percentiles(cold), "warm": _percentiles(warm)}
+
+
+def bench_phases(iterations):
+    """Per-phase timings (ms, best of iterations) of the shipped build and search path for every dataset"""
+    datasets = [(domain, config["file"], config["search_cols"], config["output_cols"], DOMAIN_QUERIES[domain][0])
+                for domain, config in CSV_CONFIG.items()]
+    datasets += [(f"stack:{stack}", config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"],
+                  STACK_QUERIES[0]) for stack, config in STACK_CONFIG.items()]
+
+    phases = {}
+    for name, file, search_cols, output_cols, query in datasets:
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            continue
+        best = {"load": float("inf"), "fit": float("inf"), "score": float("inf"), "format": float("inf")}
+        for _ in range(iterations):
+            # The same steps core._build_dataset_index() and DatasetIndex.search() run
+            start = time.perf_counter()
+            header, data = core._read_csv_cells(filepath)
+            best["load"] = min(best["load"], time.perf_counter() - start)
+
+            start = time.perf_counter()
+            rows, bm25 = core._fit_rows(header, data, search_cols, output_cols)
+            best["fit"] = min(best["fit"], time.perf_counter() - start)
+
+            index = core.DatasetIndex(rows, bm25, {})
+            bm25.tokenizer.tokenize_query.cache_clear()
+            start = time.perf_counter()
+            hits = index.search(query, core.MAX_RESULTS)
+            best["score"] = min(best["score"], time.perf_counter() - start)
+
+            results = [row for row, _ in hits]
+            start = time.perf_counter()
+            format_output({"domain": name, "query": query, "file": file, "count": len(results), "results": results})
+            best["format"] = min(best["format"], time.perf_counter() - start)
+        phases[name] = {phase: round(seconds * 1000, 4) for phase, seconds in best.items()}
+
+    design_system = DesignSystemGenerator().generate(DESIGN_SYSTEM_QUERIES[0])
+    phases["design_system:format"] = {"format": round(min(
+        _time(lambda: format_ascii_box(design_system)) for _ in range(iterations)) * 1000, 4)}
+    return phases
+
+
+def bench_memory():
+    """Peak traced memory (KiB) of loading every index and running the corpus once"""
+    core.clear_cache()
+    tracemalloc.start()
+    for _, fn in _workload():
+        fn()
+    DesignSystemGenerator().generate(DESIGN_SYSTEM_QUERIES[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_kib": round(peak / 1024, 1)}
+
+
+def _importtime(command):
+    """(total import ms, imported module names) of one fresh `python -X importtime` run"""
+    result = subprocess.run([sys.executable, "-X", "importtime", *command], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    total_us, modules = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        modules.add(name.strip())
+        if not name[1:].startswith(" "):  # top-level imports; nested ones are in their cumulative time
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def bench_startup(iterations):
+    """Import time and wall time of a plain domain search in a fresh interpreter"""
+    import_ms, wall, modules = [], [], set()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        ms, imported = _importtime(STARTUP_COMMAND)
+        wall.append(time.perf_counter() - start)
+        import_ms.append(ms)
+        modules |= imported
+    import_ms.sort()
+    return {"import_ms": round(import_ms[len(import_ms) // 2], 3), "wall": _percentiles(wall),
+            "lazy_imported": sorted(m for m in LAZY_MODULES if m in modules)}
+
+
+def run(iterations):
+    core.build_index()  # cold numbers measure loading the stored index, not building it
+    return {
+        "iterations": iterations,
+        "search": bench_queries(iterations),
+        "design_system": bench_design_system(iterations),
+        "phases": bench_phases(iterations),
+        "memory": bench_memory(),
+        "startup": bench_startup(min(iterations, 10)),
+    }
+
+
+# ============ BASELINE COMPARISON ============
+def _flatten(report, prefix=""):
+    """{'search.cold.p50_ms': value, ...} for every numeric metric"""
+    metrics = {}
+    for key, value in report.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(_flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and key not in ("iterations", "queries"):
+            metrics[path] = value
+    return metrics
+
+
+def compare(report, baseline, threshold):
+    """Metrics that got worse than baseline * (1 + threshold)"""
+    current, previous = _flatten(report), _flatten(baseline)
+    regressions = []
+    for metric, before in previous.items():
+        after = current.get(metric)
+        if after is not None and before > 0 and after > before * (1 + threshold):
+            regressions.append({"metric": metric, "baseline": before, "current": after,
+                                "change": f"+{(after / before - 1) * 100:.0f}%"})
+    return regressions
+
+
+def print_report(report):
+    print(f"## UI Pro Max Benchmark ({report['iterations']} iterations)")
+    s = report["search"]
+    print(f"search ({s['queries']} queries)  cold p50 {s['cold']['p50_ms']:.3f} ms  p99 {s['cold']['p99_ms']:.3f} ms"
+          f"  |  warm p50 {s['warm']['p50_ms']:.3f} ms  p99 {s['warm']['p99_ms']:.3f} ms")
+    d = report["design_system"]
+    print(f"design system               cold p50 {d['cold']['p50_ms']:.3f} ms  p99 {d['cold']['p99_ms']:.3f} ms"
+          f"  |  warm p50 {d['warm']['p50_ms']:.3f} ms  p99 {d['warm']['p99_ms']:.3f} ms")
+    print(f"peak memory                 {report['memory']['peak_kib']} KiB")
+    st = report["startup"]
+    print(f"plain-search startup        imports {st['import_ms']:.1f} ms  wall p50 {st['wall']['p50_ms']:.1f} ms"
+          f"  eager lazy modules: {', '.join(st['lazy_imported']) or 'none'}\n")
+    print(f"{'dataset':<24} {'load ms':>9} {'fit ms':>9} {'score ms':>9} {'format ms':>10}")
+    for name, phase in report["phases"].items():
+        print(f"{name:<24} {phase.get('load', 0):>9.3f} {phase.get('fit', 0):>9.3f} "
+              f"{phase.get('score', 0):>9.3f} {phase.get('format', 0):>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max search benchmark")
+    parser.add_argument("--iterations", "-i", type=int, default=20, help="Repetitions per measurement (default: 20)")
+    parser.add_argument("--save", type=str, default=None, help="Write the report as a baseline JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before flagging (default: 0.25)")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+    parser.add_argument("--startup", action="store_true", help="Only check plain-search startup against --budget")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS,
+                        help=f"Plain-search import time budget in ms (default: {STARTUP_BUDGET_MS})")
+    args = parser.parse_args()
+
+    if args.startup:
+        core.build_index()  # measure startup against a current on-disk index
+        startup = bench_startup(args.iterations)
+        print(json.dumps(startup, indent=2) if args.json else
+              f"plain-search imports {startup['import_ms']:.1f} ms (budget {args.budget:g} ms), "
+              f"wall p50 {startup['wall']['p50_ms']:.1f} ms")
+        failures = []
+        if startup["import_ms"] > args.budget:
+            failures.append(f"import time {startup['import_ms']:.1f} ms exceeds budget {args.budget:g} ms")
+        if startup["lazy_imported"]:
+            failures.append(f"lazily loaded modules imported: {', '.join(startup['lazy_imported'])}")
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1 if failures else 0)
+
+    report = run(args.iterations)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"  {r['metric']}: {r['baseline']} -> {r['current']} ({r['change']})")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.threshold:.0%}")
@@ -4,14 +4,41 @@
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
-import csv
-import re
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from heapq import nlargest
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from tokenizer import Tokenizer, STOP_WORDS
+# csv, hashlib and numpy are imported where used: a search against a current index needs none of them
+
+np = None  # NumPy, imported on first use by _load_numpy() (small corpora never need it)
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = DATA_DIR / ".index"
+INDEX_VERSION = 3
+MANIFEST_FILE = "manifest.json"   # per-segment content hashes and document frequencies
+GLOBAL_STATS_FILE = "global.json" # merged corpus statistics for cross-domain IDF
+BM25_BACKEND = os.environ.get("UIPRO_BM25_BACKEND", "auto")  # auto | numpy | python
+TOKENIZER = Tokenizer(
+    stop_words=STOP_WORDS if os.environ.get("UIPRO_STOP_WORDS") == "1" else None,
+    stem=os.environ.get("UIPRO_STEM") == "1"
+)
+FUZZY_THRESHOLD = 0.5       # min trigram/prefix similarity for an expansion
+FUZZY_WEIGHT = 0.6          # expanded terms score at FUZZY_WEIGHT * similarity of an exact hit
+FUZZY_MAX_EXPANSIONS = 3
+FUZZY_MIN_LENGTH = 4        # shorter unknown tokens are not expanded
+NUMPY_MIN_DOCS = 200  # below this the pure-Python postings loop is as fast
+RESULT_CACHE_SIZE = 1024    # search()/search_stack() results kept in memory (LRU)
+RESULT_CACHE_DIR = INDEX_DIR / "results" if os.environ.get("UIPRO_RESULT_CACHE") == "1" else None
+RESULT_CACHE_DISK_SIZE = 4096         # max entry files under RESULT_CACHE_DIR (oldest pruned first)
+RESULT_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds before a disk entry is ignored and pruned
 MAX_RESULTS = 3
 
 CSV_CONFIG = {
@@ -96,99 +123,761 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+# ============ FUZZY MATCHING ============
+def _trigrams(word):
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """Character trigram + sorted-prefix side index that maps unknown tokens to close vocabulary terms"""
+
+    def __init__(self, vocabulary, threshold=FUZZY_THRESHOLD, max_expansions=FUZZY_MAX_EXPANSIONS):
+        self.terms = sorted(vocabulary)
+        self.threshold = threshold
+        self.max_expansions = max_expansions
+        self.gram_counts = []
+        self.grams = defaultdict(list)
+        for term_id, term in enumerate(self.terms):
+            grams = _trigrams(term)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.grams[gram].append(term_id)
+        self.expand = lru_cache(maxsize=4096)(self._expand)
+
+    def _expand(self, token):
+        """[(term, similarity)] best first; similarity is trigram Jaccard or prefix coverage"""
+        grams = _trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for term_id in self.grams.get(gram, ()):
+                shared[term_id] += 1
+
+        matches = {}
+        for term_id, count in shared.items():
+            similarity = count / (len(grams) + self.gram_counts[term_id] - count)
+            if similarity >= self.threshold:
+                matches[term_id] = similarity
+
+        # Prefix matches ("glassmorph" -> "glassmorphism") score by how much of the term they cover
+        term_id = bisect_left(self.terms, token)
+        while term_id < len(self.terms) and self.terms[term_id].startswith(token):
+            similarity = len(token) / len(self.terms[term_id])
+            if similarity >= self.threshold:
+                matches[term_id] = max(matches.get(term_id, 0), similarity)
+            term_id += 1
+
+        ranked = sorted(matches.items(), key=lambda x: (-x[1], self.terms[x[0]]))[:self.max_expansions]
+        return tuple((self.terms[term_id], similarity) for term_id, similarity in ranked)
+
+
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, tokenizer=None):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.tokenizer = tokenizer or TOKENIZER
+        self.postings = {}
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
         self.N = 0
+        self._fuzzy = None
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        return self.tokenizer.tokenize(text)
+
+    def query_terms(self, query, fuzzy=True):
+        """(term, boost) pairs to score: exact hits at 1.0, expansions of unknown tokens below that"""
+        terms = []
+        for token in self.tokenizer.tokenize_query(query):
+            if token in self.idf:
+                terms.append((token, 1.0))
+            elif fuzzy and len(token) >= FUZZY_MIN_LENGTH:
+                if self._fuzzy is None:
+                    self._fuzzy = FuzzyIndex(self.idf)
+                terms.extend((term, FUZZY_WEIGHT * similarity) for term, similarity in self._fuzzy.expand(token))
+        return terms
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        corpus = [self.tokenize(doc) for doc in documents]
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
+        for idx, doc in enumerate(corpus):
             term_freqs = defaultdict(int)
             for word in doc:
                 term_freqs[word] += 1
+            # Length normalization is fixed per document, so fold it into the posting
+            length_norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avgdl)
+            for word, tf in term_freqs.items():
+                plist = self.postings.get(word)
+                if plist is None:
+                    word = self.tokenizer.intern(word)
+                    plist = self.postings[word] = []
+                self.doc_freqs[word] += 1
+                plist.append((idx, tf * (self.k1 + 1) / (tf + length_norm)))
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+        for word, freq in self.doc_freqs.items():
+            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-            scores.append((idx, score))
+    def score(self, query, top_k=None, fuzzy=True):
+        """Score documents containing query terms; return (idx, score) best first"""
+        scores = defaultdict(float)
+
+        for term, boost in self.query_terms(query, fuzzy):
+            idf = self.idf[term]
+            if boost == 1.0:
+                for idx, weight in self.postings[term]:
+                    scores[idx] += idf * weight
+            else:
+                for idx, weight in self.postings[term]:
+                    scores[idx] += idf * weight * boost
+
+        # Ties keep corpus order, as a stable full sort would
+        key = lambda x: (x[1], -x[0])
+        if top_k is None:
+            return sorted(scores.items(), key=key, reverse=True)
+        return nlargest(top_k, scores.items(), key=key)
+
+    def to_dict(self):
+        """Serialize the fitted index (postings, IDF table, doc lengths)"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "tokenizer": self.tokenizer.config(),
+            "N": self.N,
+            "avgdl": self.avgdl,
+            "doc_lengths": self.doc_lengths,
+            "idf": self.idf,
+            "doc_freqs": dict(self.doc_freqs),
+            "postings": self.postings
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a fitted index produced by to_dict()"""
+        bm25 = cls(data["k1"], data["b"])
+        bm25.N = data["N"]
+        bm25.avgdl = data["avgdl"]
+        bm25.doc_lengths = data["doc_lengths"]
+        bm25.idf = data["idf"]
+        bm25.doc_freqs.update(data["doc_freqs"])
+        bm25.postings = {bm25.tokenizer.intern(term): [tuple(p) for p in plist]
+                         for term, plist in data["postings"].items()}
+        return bm25
+
+
+class NumpyBM25(BM25):
+    """BM25 over a CSR term-document matrix of precomputed weights (requires NumPy)"""
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    def fit(self, documents):
+        super().fit(documents)
+        self._compile()
+
+    @classmethod
+    def from_dict(cls, data):
+        bm25 = super().from_dict(data)
+        bm25._compile()
+        return bm25
+
+    def _compile(self):
+        """Pack postings into CSR arrays: row = term, column = doc, value = idf * tf weight"""
+        self.vocab = {}
+        indptr = [0]
+        indices = []
+        weights = []
+        for term, plist in self.postings.items():
+            self.vocab[term] = len(self.vocab)
+            idf = self.idf[term]
+            for idx, weight in plist:
+                indices.append(idx)
+                weights.append(idf * weight)
+            indptr.append(len(indices))
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.weights = np.array(weights, dtype=np.float64)
+
+    def score(self, query, top_k=None, fuzzy=True):
+        """Gather the query terms' rows and sum them per document"""
+        terms = self.query_terms(query, fuzzy)
+        if not terms:
+            return []
+        slices = [(slice(self.indptr[self.vocab[term]], self.indptr[self.vocab[term] + 1]), boost)
+                  for term, boost in terms]
+        scores = np.bincount(np.concatenate([self.indices[sl] for sl, _ in slices]),
+                             weights=np.concatenate([self.weights[sl] if boost == 1.0 else self.weights[sl] * boost
+                                                     for sl, boost in slices]),
+                             minlength=self.N)
+
+        candidates = np.flatnonzero(scores)
+        if top_k is not None and top_k < len(candidates):
+            # Keep everything tied with the k-th score so ties resolve by corpus order
+            kth = np.partition(scores[candidates], len(candidates) - top_k)[len(candidates) - top_k]
+            candidates = candidates[scores[candidates] >= kth]
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))][:top_k]
+        return [(int(idx), float(scores[idx])) for idx in ranked]
+
+
+def _load_numpy():
+    """Import NumPy on demand; False when it is not installed"""
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = False
+    return np
+
+
+def _bm25_class(n_docs):
+    """Pick the scoring backend for a corpus of n_docs documents"""
+    if BM25_BACKEND == "python":
+        return BM25
+    if (BM25_BACKEND == "numpy" or n_docs >= NUMPY_MIN_DOCS) and _load_numpy():
+        return NumpyBM25
+    return BM25
+
+
+# ============ PRECOMPILED INDEX ============
+class RowStore:
+    """Columnar output rows: each column is stored once and dicts are built only for hits"""
+
+    __slots__ = ("columns", "data", "size")
+
+    def __init__(self, columns, data=None, size=0):
+        self.columns = list(columns)
+        self.data = data if data is not None else [[] for _ in self.columns]
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def append(self, values):
+        for column, value in zip(self.data, values):
+            column.append(value)
+        self.size += 1
+
+    def row(self, idx):
+        """Materialize one row as {column: value}"""
+        return {col: values[idx] for col, values in zip(self.columns, self.data)}
+
+    def compact(self):
+        """Share one object per repeated value in categorical columns (Category, Severity, ...)"""
+        for values in self.data:
+            if len(set(values)) <= len(values) // 2:
+                values[:] = [_VALUES.setdefault(v, v) for v in values]
+        return self
+
+    def to_dict(self):
+        return {"columns": self.columns, "data": self.data, "size": self.size}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["columns"], data["data"], data["size"]).compact()
+
+
+class DatasetIndex:
+    """Fitted BM25 index plus the output rows of one CSV dataset"""
+
+    def __init__(self, rows, bm25, source):
+        self.rows = rows
+        self.bm25 = bm25
+        self.source = source
+
+    def search(self, query, max_results, fuzzy=True):
+        """Return (output dict, score) for the top results with score > 0"""
+        results = []
+        for idx, score in self.bm25.score(query, max_results, fuzzy):
+            if score > 0:
+                results.append((self.rows.row(idx), score))
+        return results
+
+    def to_dict(self):
+        return {
+            "version": INDEX_VERSION,
+            "source": self.source,
+            "rows": self.rows.to_dict(),
+            "bm25": self.bm25.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(RowStore.from_dict(data["rows"]), _bm25_class(data["bm25"]["N"]).from_dict(data["bm25"]),
+                   data["source"])
+
+
+class ResultCache:
+    """LRU of scored hits, optionally backed by one JSON file per entry on disk"""
+
+    PRUNE_EVERY = 64  # disk writes between directory scans
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE, directory=None,
+                 disk_size=RESULT_CACHE_DISK_SIZE, max_age=RESULT_CACHE_MAX_AGE):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.disk_size = disk_size
+        self.max_age = max_age
+        self._writes = 0
+        self.hits = self.misses = self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()  # the search daemon serves requests from several threads
+
+    @staticmethod
+    def key(index, query, max_results, fuzzy):
+        """Dataset version + sorted normalized query tokens: 'SaaS dashboard' == 'dashboard  saas'
+
+        Everything else that changes scoring or the returned columns is part of the key
+        too, so disk entries written under another tokenizer, index format, fuzzy setting
+        or output column set are never reused.
+        """
+        tokens = sorted(index.bm25.tokenizer.tokenize_query(query))
+        scoring = [INDEX_VERSION, index.bm25.tokenizer.config(),
+                   FUZZY_THRESHOLD, FUZZY_WEIGHT, FUZZY_MAX_EXPANSIONS, FUZZY_MIN_LENGTH]
+        return json.dumps([index.source["sha256"], index.source["search_cols"], index.source["output_cols"],
+                           tokens, max_results, fuzzy, scoring])
+
+    def _path(self, key):
+        import hashlib
+        return self.directory / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key):
+        """Cached (row, score) pairs (fresh row dicts), or None"""
+        with self._lock:
+            hits = self._entries.get(key)
+            if hits is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if hits is None and self.directory is not None and not self._expired(self._path(key)):
+            data = _read_json(self._path(key))
+            if data is not None and data.get("key") == key:
+                hits = [(row, score) for row, score in data["hits"]]
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, hits)
+        if hits is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return [(dict(row), score) for row, score in hits]
+
+    def put(self, key, hits):
+        """Store copies of hits so callers may mutate what they were given"""
+        hits = [(dict(row), score) for row, score in hits]
+        self._remember(key, hits)
+        if self.directory is not None:
+            _write_json(self._path(key), {"key": key, "hits": hits})
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % self.PRUNE_EVERY == 1
+            if prune:
+                self.prune()
+
+    def _expired(self, path):
+        try:
+            return time.time() - path.stat().st_mtime > self.max_age
+        except OSError:
+            return True
+
+    def prune(self):
+        """Delete disk entries older than max_age, then the oldest beyond disk_size"""
+        if self.directory is None:
+            return
+        now = time.time()
+        entries = []
+        try:
+            for path in self.directory.glob("*.json"):
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue
+                if now - mtime > self.max_age:
+                    path.unlink(missing_ok=True)
+                else:
+                    entries.append((mtime, path))
+            entries.sort()
+            for _, path in entries[:max(0, len(entries) - self.disk_size)]:
+                path.unlink(missing_ok=True)
+        except OSError:
+            pass  # read-only install or a concurrent prune
+
+    def _remember(self, key, hits):
+        with self._lock:
+            self._entries[key] = hits
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop in-memory entries (hit/miss counters and the disk cache are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                    "size": len(self._entries), "maxsize": self.maxsize,
+                    "disk": str(self.directory) if self.directory is not None else None}
+
+
+# Process-wide caches, revalidated against each CSV's mtime/size on access
+_INDEXES = {}
+_ROWS = {}
+_VALUES = {}  # interning table for repeated categorical cell values
+_RESULTS = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_DIR)
+
+
+def _file_signature(filepath):
+    """Cheap change detection: modification time and size"""
+    stat = filepath.stat()
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _file_hash(filepath):
+    """Content hash used when the signature changed but the bytes may not have"""
+    import hashlib
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _index_path(filepath):
+    """On-disk index location for a CSV (e.g. stacks/react.csv -> .index/stacks__react.json)"""
+    relative = filepath.relative_to(DATA_DIR).with_suffix("")
+    return INDEX_DIR / ("__".join(relative.parts) + ".json")
+
+
+def _read_csv_cells(filepath):
+    """(header, rows of cells) with csv.DictReader's semantics: blank lines skipped, short rows padded with None"""
+    import csv
+    with open(filepath, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return header, [row + [None] * (len(header) - len(row)) for row in reader if row]
+
+
+def _fit_rows(header, data, search_cols, output_cols):
+    """(RowStore of output columns, BM25 fitted on the search columns), filled in one streaming pass"""
+    position = {col: i for i, col in enumerate(header)}
+    rows = RowStore([col for col in output_cols if col in position])
+    output_pos = [position[col] for col in rows.columns]
+    search_pos = [position.get(col) for col in search_cols]
+
+    def documents():
+        for cells in data:
+            rows.append([cells[i] for i in output_pos])
+            yield " ".join("" if i is None else str(cells[i]) for i in search_pos)
+
+    bm25 = _bm25_class(len(data))()
+    bm25.fit(documents())
+    return rows.compact(), bm25
+
+
+def _build_dataset_index(filepath, search_cols, output_cols):
+    """Parse a CSV and fit a fresh BM25 index over its search columns"""
+    rows, bm25 = _fit_rows(*_read_csv_cells(filepath), search_cols, output_cols)
+    source = _file_signature(filepath)
+    source["sha256"] = _file_hash(filepath)
+    source["search_cols"] = search_cols
+    source["output_cols"] = output_cols
+    return DatasetIndex(rows, bm25, source)
+
+
+def _read_index(filepath, search_cols, output_cols):
+    """Load a stored index if it is still valid for the CSV, else None"""
+    data = _read_json(_index_path(filepath))
+    if data is None:
+        return None
+
+    source = data.get("source", {})
+    if (data.get("version") != INDEX_VERSION
+            or source.get("search_cols") != search_cols
+            or source.get("output_cols") != output_cols
+            or data.get("bm25", {}).get("tokenizer") != TOKENIZER.config()):
+        return None
+
+    index = DatasetIndex.from_dict(data)
+    if _is_current(source, filepath):
+        return index
+
+    # File was touched: only rebuild if the content actually changed
+    if source.get("sha256") != _file_hash(filepath):
+        return None
+    index.source.update(_file_signature(filepath))
+    _write_index(filepath, index)
+    return index
+
+
+def _read_json(path):
+    """Parsed JSON file, or None if missing or corrupt"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """Atomically write JSON under INDEX_DIR; silently skip on read-only installs"""
+    # Per-writer temp name: processes and threads may write the same file concurrently
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _write_index(filepath, index):
+    """Store an index segment next to the data"""
+    _write_json(_index_path(filepath), index.to_dict())
+
+
+def _is_current(source, filepath):
+    """True if the CSV has not been touched since source was recorded"""
+    signature = _file_signature(filepath)
+    return source.get("mtime") == signature["mtime"] and source.get("size") == signature["size"]
+
+
+def _get_index(filepath, search_cols, output_cols, rebuild=False):
+    """Return the index for a CSV: in-memory, then on-disk, then freshly built"""
+    key = str(filepath)
+    index = None if rebuild else _INDEXES.get(key)
+    if index is not None and not _is_current(index.source, filepath):
+        index = None
+    if index is None:
+        if not rebuild:
+            index = _read_index(filepath, search_cols, output_cols)
+        if index is None:
+            index = _build_dataset_index(filepath, search_cols, output_cols)
+            _write_index(filepath, index)
+        _INDEXES[key] = index
+    return index
+
+
+def _iter_datasets():
+    """Yield (name, file, search_cols, output_cols) for every dataset; stacks are named stack:<stack>"""
+    for domain, config in CSV_CONFIG.items():
+        yield domain, config["file"], config["search_cols"], config["output_cols"]
+    for stack, config in STACK_CONFIG.items():
+        yield f"stack:{stack}", config["file"], _STACK_COLS["search_cols"], _STACK_COLS["output_cols"]
+
+
+def _merge_doc_freqs(totals, doc_freqs, sign):
+    for term, freq in doc_freqs.items():
+        totals[term] = totals.get(term, 0) + sign * freq
+        if totals[term] <= 0:
+            del totals[term]
+
+
+def reindex(changed_only=True):
+    """
+    Rebuild index segments and merge their statistics into the global IDF table.
+
+    changed_only: only datasets whose CSV content hash differs from the manifest are
+    rebuilt; untouched segments are not even read. Otherwise every segment is rebuilt.
+    Returns one {"file", "status", "docs", "terms"} entry per dataset.
+    """
+    manifest = _read_json(INDEX_DIR / MANIFEST_FILE) or {}
+    if not _stats_current(manifest):
+        manifest = {}  # built by another index version or tokenizer: every segment is stale
+    segments = manifest.get("segments", {})
+    doc_freqs = manifest.get("doc_freqs", {})
+    total_docs = manifest.get("N", 0)
+
+    report = []
+    configured = set()
+    for _, file, search_cols, output_cols in _iter_datasets():
+        filepath = DATA_DIR / file
+        if not filepath.exists():
+            continue
+        configured.add(file)
+        entry = segments.get(file)
+        if (changed_only and entry and entry["sha256"] == _file_hash(filepath)
+                and _index_path(filepath).exists()):
+            report.append({"file": file, "status": "unchanged", "docs": entry["docs"], "terms": len(entry["doc_freqs"])})
+            continue
+
+        # A segment already rebuilt lazily at query time is reused rather than rebuilt again
+        index = _get_index(filepath, search_cols, output_cols, rebuild=not changed_only)
+        if entry:
+            _merge_doc_freqs(doc_freqs, entry["doc_freqs"], -1)
+            total_docs -= entry["docs"]
+        _merge_doc_freqs(doc_freqs, index.bm25.doc_freqs, 1)
+        total_docs += index.bm25.N
+        segments[file] = {"sha256": index.source["sha256"], "docs": index.bm25.N,
+                          "doc_freqs": dict(index.bm25.doc_freqs)}
+        report.append({"file": file, "status": "rebuilt", "docs": index.bm25.N, "terms": len(index.bm25.idf)})
+
+    for file in [f for f in segments if f not in configured]:
+        entry = segments.pop(file)
+        _merge_doc_freqs(doc_freqs, entry["doc_freqs"], -1)
+        total_docs -= entry["docs"]
+        report.append({"file": file, "status": "removed", "docs": 0, "terms": 0})
+
+    tokenizer = TOKENIZER.config()
+    _write_json(INDEX_DIR / MANIFEST_FILE, {"version": INDEX_VERSION, "tokenizer": tokenizer, "N": total_docs,
+                                            "doc_freqs": doc_freqs, "segments": segments})
+    _write_json(INDEX_DIR / GLOBAL_STATS_FILE, {
+        "version": INDEX_VERSION, "tokenizer": tokenizer, "N": total_docs, "doc_freqs": doc_freqs,
+        "segments": {file: entry["sha256"] for file, entry in segments.items()}
+    })
+    return report
+
+
+def _stats_current(stored):
+    """True if stored manifest/global stats were built by this INDEX_VERSION and tokenizer config"""
+    return stored.get("version") == INDEX_VERSION and stored.get("tokenizer") == TOKENIZER.config()
+
+
+def load_indexes(names=None):
+    """Bring dataset indexes (all if names is None) into memory; manifest and global stats are not touched"""
+    wanted = None if names is None else set(names)
+    for name, file, search_cols, output_cols in _iter_datasets():
+        filepath = DATA_DIR / file
+        if (wanted is None or name in wanted) and filepath.exists():
+            _get_index(filepath, search_cols, output_cols)
+
+
+def build_index(force=False):
+    """Compile every CSV_CONFIG and STACK_CONFIG dataset into the on-disk index"""
+    return reindex(changed_only=not force)
+
+
+# ============ UNIFIED INDEX ============
+class UnifiedIndex:
+    """Every dataset's index behind one view; documents are (segment id, row index) pairs"""
+
+    def __init__(self, segments, stats=None):
+        """segments: list of (name, file, DatasetIndex); stats: merged {"N", "doc_freqs"} if precomputed"""
+        self.segments = segments
+        self.stats = stats
+        self._global_idf = None
+        self.names = {name: seg_id for seg_id, (name, _, _) in enumerate(segments)}
+
+    def global_idf(self):
+        """IDF over all merged segments, from the stored global stats or summed on first use"""
+        if self._global_idf is None:
+            stats = self.stats
+            if stats is None:
+                doc_freqs = {}
+                for _, _, index in self.segments:
+                    _merge_doc_freqs(doc_freqs, index.bm25.doc_freqs, 1)
+                stats = {"N": sum(index.bm25.N for _, _, index in self.segments), "doc_freqs": doc_freqs}
+            n = stats["N"]
+            self._global_idf = {term: log((n - freq + 0.5) / (freq + 0.5) + 1)
+                                for term, freq in stats["doc_freqs"].items()}
+        return self._global_idf
+
+    def score(self, query, segment_ids, fuzzy=True):
+        """
+        Score the given segments with corpus-wide IDF, so scores compare across
+        domains: {(segment id, row index): score}. Each segment's own postings are
+        read in place.
+        """
+        scores = defaultdict(float)
+        idf_table = self.global_idf()
+        for seg_id in segment_ids:
+            bm25 = self.segments[seg_id][2].bm25
+            # Query terms (and fuzzy expansions) come from each dataset's own vocabulary
+            for term, boost in bm25.query_terms(query, fuzzy):
+                idf = idf_table[term] * boost
+                for idx, weight in bm25.postings[term]:
+                    scores[seg_id, idx] += idf * weight
+        return scores
+
+    def row(self, doc):
+        """Output dict for a (segment id, row index) document"""
+        seg_id, idx = doc
+        return self.segments[seg_id][2].rows.row(idx)
+
+
+_UNIFIED = {}
+
+
+def _get_unified(domains=None):
+    """Unified index over the given datasets (all if None), rebuilt when any of them changes"""
+    wanted = None if domains is None else frozenset(domains)
+    segments = []
+    for name, file, search_cols, output_cols in _iter_datasets():
+        filepath = DATA_DIR / file
+        if (wanted is None or name in wanted) and filepath.exists():
+            segments.append((name, file, _get_index(filepath, search_cols, output_cols)))
+
+    unified = _UNIFIED.get(wanted)
+    if unified is None or len(unified.segments) != len(segments) or any(
+            old[2] is not new[2] for old, new in zip(unified.segments, segments)):
+        stats = None
+        if wanted is None:
+            # Merged stats from reindex() are valid only if they cover exactly these segment versions
+            stored = _read_json(INDEX_DIR / GLOBAL_STATS_FILE)
+            if stored and _stats_current(stored) and stored.get("segments") == {
+                    file: index.source["sha256"] for _, file, index in segments}:
+                stats = stored
+        unified = _UNIFIED[wanted] = UnifiedIndex(segments, stats)
+    return unified
+
+
+def clear_cache():
+    """Drop all in-memory rows, indexes and cached results (the on-disk index is kept)"""
+    _INDEXES.clear()
+    _ROWS.clear()
+    _UNIFIED.clear()
+    _VALUES.clear()
+    _RESULTS.clear()
+
+
+def cache_stats():
+    """Hit/miss counters and size of the search()/search_stack() result cache"""
+    return _RESULTS.stats()
 
 
 # ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
     """Load CSV and return list of dicts"""
+    import csv
     with open(filepath, 'r', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
-
-    data = _load_csv(filepath)
+def load_rows(filepath):
+    """Load CSV rows through the process-wide cache (callers must not mutate them)"""
+    key = str(filepath)
+    cached = _ROWS.get(key)
+    if cached is not None and _is_current(cached[0], filepath):
+        return cached[1]
+    rows = _load_csv(filepath)
+    _ROWS[key] = (_file_signature(filepath), rows)
+    return rows
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
-
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+def _search_csv(filepath, search_cols, output_cols, query, max_results, fuzzy=True):
+    """Core search function using BM25; returns (row, score) pairs, served from the result cache when possible"""
+    if not filepath.exists():
+        return []
 
-    return results
+    index = _get_index(filepath, search_cols, output_cols)
+    key = ResultCache.key(index, query, max_results, fuzzy)
+    hits = _RESULTS.get(key)
+    if hits is None:
+        hits = index.search(query, max_results, fuzzy)
+        _RESULTS.put(key, hits)
+    return hits
 
 
 def detect_domain(query):
@@ -214,8 +903,17 @@ def detect_domain(query):
     return best if scores[best] > 0 else "style"
 
 
-def search(query, domain=None, max_results=MAX_RESULTS):
-    """Main search function with auto-domain detection"""
+def _with_results(result, hits, with_scores):
+    """Fill count/results (and the parallel scores list when requested) from (row, score) pairs"""
+    result["count"] = len(hits)
+    result["results"] = [row for row, _ in hits]
+    if with_scores:
+        result["scores"] = [round(score, 4) for _, score in hits]
+    return result
+
+
+def search(query, domain=None, max_results=MAX_RESULTS, fuzzy=True, with_scores=False):
+    """Main search function with auto-domain detection (fuzzy expands unknown query terms)"""
     if domain is None:
         domain = detect_domain(query)
 
@@ -225,18 +923,16 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    hits = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results, fuzzy)
 
-    return {
+    return _with_results({
         "domain": domain,
         "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+        "file": config["file"]
+    }, hits, with_scores)
 
 
-def search_stack(query, stack, max_results=MAX_RESULTS):
+def search_stack(query, stack, max_results=MAX_RESULTS, fuzzy=True, with_scores=False):
     """Search stack-specific guidelines"""
     if stack not in STACK_CONFIG:
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
@@ -246,13 +942,77 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    hits = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results, fuzzy)
 
-    return {
+    return _with_results({
         "domain": "stack",
         "stack": stack,
         "query": query,
-        "file": STACK_CONFIG[stack]["file"],
-        "count": len(results),
-        "results": results
-    }
+        "file": STACK_CONFIG[stack]["file"]
+    }, hits, with_scores)
+
+
+def search_many(queries, domain=None, max_results=MAX_RESULTS, fuzzy=True, stack=None):
+    """
+    Run many searches against one set of loaded indexes, yielding results in order.
+
+    Each query is either a string (searched in `stack` if given, else in `domain`,
+    auto-detected if None) or a dict with "query" and optional "domain", "stack",
+    "max_results" and "fuzzy" keys; an item's own "domain" overrides `stack`. A bad item yields {"error": ...} and the batch
+    carries on; a dict with only an "error" (e.g. an unparsable input line) is passed through.
+    """
+    for item in queries:
+        if not isinstance(item, dict):
+            item = {"query": item}
+        if "query" not in item:
+            yield {"error": item["error"] if "error" in item else "Missing 'query' field"}
+            continue
+        try:
+            if not isinstance(item["query"], str):
+                raise TypeError("'query' must be a string")
+            item_stack = item.get("stack", None if "domain" in item else stack)
+            if item_stack:
+                yield search_stack(item["query"], item_stack, item.get("max_results", max_results),
+                                   item.get("fuzzy", fuzzy))
+            else:
+                yield search(item["query"], item.get("domain", domain), item.get("max_results", max_results),
+                             item.get("fuzzy", fuzzy))
+        except Exception as e:
+            yield {"error": f"{type(e).__name__}: {e}"}
+
+
+def search_all(query, domains=None, max_results=MAX_RESULTS, fuzzy=True, with_scores=False):
+    """
+    Top-k per domain: search() / search_stack() (and their result cache) for each dataset.
+
+    domains: dataset names (CSV_CONFIG keys, "stack:<stack>"); all datasets if None.
+    max_results: an int, or a dict of per-domain limits.
+    Returns {domain: result} where each result has the same shape as search()/search_stack().
+    """
+    if domains is None:
+        domains = [name for name, _, _, _ in _iter_datasets()]
+    output = {}
+    for name in domains:
+        limit = max_results.get(name, MAX_RESULTS) if isinstance(max_results, dict) else max_results
+        if name.startswith("stack:") and name[len("stack:"):] in STACK_CONFIG:
+            output[name] = search_stack(query, name[len("stack:"):], limit, fuzzy, with_scores)
+        elif name in CSV_CONFIG:
+            output[name] = search(query, name, limit, fuzzy, with_scores)
+        else:
+            output[name] = {"error": f"Unknown domain: {name}"}
+    return output
+
+
+def search_global(query, domains=None, max_results=MAX_RESULTS, fuzzy=True):
+    """Top-k across all (or the given) domains, ranked with corpus-wide IDF; hits are tagged with their domain"""
+    unified = _get_unified(domains)
+    segment_ids = list(unified.names.values()) if domains is None else [
+        unified.names[name] for name in domains if name in unified.names]
+    scores = unified.score(query, segment_ids, fuzzy)
+    # Ties keep dataset order, then corpus order
+    top = nlargest(max_results, scores.items(), key=lambda x: (x[1], -x[0][0], -x[0][1]))
+    results = []
+    for doc, score in top:
+        name, file, _ = unified.segments[doc[0]]
+        results.append({"domain": name, "file": file, "score": round(score, 4), "result": unified.row(doc)})
+    return {"domain": "all", "query": query, "count": len(results), "results": results}
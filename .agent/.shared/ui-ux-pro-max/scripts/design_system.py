@@ -7,18 +7,29 @@ to generate comprehensive design system recommendations.
 Usage:
     from design_system import generate_design_system
     result = generate_design_system("SaaS dashboard", "My Project")
+
+    # Many briefs at once, fanned out across a process pool
+    from design_system import generate_batch
+    report = generate_batch([{"query": "SaaS dashboard", "project_name": "My Project", "page": "dashboard"}])
     
+    # Machine-readable: raw dict plus per-domain search scores ("json" / "msgpack" serialize it)
+    data = generate_design_system("SaaS dashboard", output_format="dict")
+
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
 """
 
-import csv
+import hashlib
 import json
 import os
+import re
+import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, load_rows, build_index, load_indexes, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -33,61 +44,90 @@ SEARCH_CONFIG = {
 }
 
 
+# ============ REASONING RULES ============
+class ReasoningIndex:
+    """Precomputed lookup over ui-reasoning.csv rules (built once per process)."""
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self.categories = [(rule.get("UI_Category") or "").lower() for rule in rules]
+        self.exact = {}
+        self.keywords = {}  # keyword -> index of the first rule that contains it
+        for i, ui_cat in enumerate(self.categories):
+            self.exact.setdefault(ui_cat, i)
+            for kw in ui_cat.replace("/", " ").replace("-", " ").split():
+                self.keywords.setdefault(kw, i)
+        self.decision_rules = [self._parse_decision_rules(rule) for rule in rules]
+        self._lookups = {}
+
+    @staticmethod
+    def _parse_decision_rules(rule: dict) -> dict:
+        try:
+            return json.loads(rule.get("Decision_Rules") or "{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def find(self, category: str):
+        """Index of the matching rule for a category (exact, then partial, then keyword), or None."""
+        category_lower = category.lower()
+        if category_lower in self._lookups:
+            return self._lookups[category_lower]
+
+        index = self.exact.get(category_lower)
+        if index is None:
+            index = next((i for i, ui_cat in enumerate(self.categories)
+                          if ui_cat in category_lower or category_lower in ui_cat), None)
+        if index is None:
+            index = min((i for kw, i in self.keywords.items() if kw in category_lower), default=None)
+        self._lookups[category_lower] = index
+        return index
+
+
+_REASONING_INDEX = None
+
+
+def _reasoning_index() -> ReasoningIndex:
+    """Process-wide ReasoningIndex, rebuilt only when the reasoning CSV changes."""
+    global _REASONING_INDEX
+    filepath = DATA_DIR / REASONING_FILE
+    rules = load_rows(filepath) if filepath.exists() else []
+    if _REASONING_INDEX is None or _REASONING_INDEX.rules is not rules:
+        _REASONING_INDEX = ReasoningIndex(rules)
+    return _REASONING_INDEX
+
+
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
 
     def __init__(self):
-        self.reasoning_data = self._load_reasoning()
-
-    def _load_reasoning(self) -> list:
-        """Load reasoning rules from CSV."""
-        filepath = DATA_DIR / REASONING_FILE
-        if not filepath.exists():
-            return []
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return list(csv.DictReader(f))
+        self.reasoning = _reasoning_index()
+        self.reasoning_data = self.reasoning.rules
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
+    def _multi_domain_search(self, query: str, style_priority: list = None, with_scores: bool = False) -> dict:
         """Execute searches across multiple domains."""
         results = {}
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
-                priority_query = " ".join(style_priority[:2]) if style_priority else query
-                combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                priority_query = " ".join(style_priority[:2])
+                results[domain] = search(f"{query} {priority_query}", domain, config["max_results"],
+                                         with_scores=with_scores)
             else:
-                results[domain] = search(query, domain, config["max_results"])
+                results[domain] = search(query, domain, config["max_results"], with_scores=with_scores)
         return results
 
-    def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+    def _find_reasoning_rule(self, category: str) -> tuple:
+        """Find matching reasoning rule for a category: (rule, parsed decision rules), or ({}, {})."""
+        index = self.reasoning.find(category)
+        if index is None:
+            return {}, {}
+        # Decision rules JSON is parsed once per process; copy so callers can't mutate the cache
+        return self.reasoning.rules[index], dict(self.reasoning.decision_rules[index])
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        rule, decision_rules = self._find_reasoning_rule(category)
 
         if not rule:
             return {
@@ -101,13 +141,6 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
-
         return {
             "pattern": rule.get("Recommended_Pattern", ""),
             "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
@@ -160,10 +193,10 @@ class DesignSystemGenerator:
         """Extract results list from search result dict."""
         return search_result.get("results", [])
 
-    def generate(self, query: str, project_name: str = None) -> dict:
-        """Generate complete design system recommendation."""
+    def generate(self, query: str, project_name: str = None, include_scores: bool = False) -> dict:
+        """Generate complete design system recommendation (optionally with per-domain search scores)."""
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        product_result = search(query, "product", 1, with_scores=include_scores)
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -174,7 +207,7 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
+        search_results = self._multi_domain_search(query, style_priority, include_scores)
         search_results["product"] = product_result  # Reuse product search
 
         # Step 4: Select best matches from each domain using priority
@@ -194,7 +227,7 @@ class DesignSystemGenerator:
         reasoning_effects = reasoning.get("key_effects", "")
         combined_effects = style_effects if style_effects else reasoning_effects
 
-        return {
+        design_system = {
             "project_name": project_name or query.upper(),
             "category": category,
             "pattern": {
@@ -234,9 +267,51 @@ class DesignSystemGenerator:
             "decision_rules": reasoning.get("decision_rules", {}),
             "severity": reasoning.get("severity", "MEDIUM")
         }
+        if include_scores:
+            design_system["search_scores"] = self._search_scores(search_results)
+        return design_system
+
+    def _search_scores(self, search_results: dict) -> dict:
+        """Per-domain BM25 scores of the candidates, keyed by each row's first output column."""
+        scores = {}
+        for domain in SEARCH_CONFIG:
+            result = search_results.get(domain, {})
+            scores[domain] = [{"name": next(iter(row.values()), ""), "score": score}
+                              for row, score in zip(result.get("results", []), result.get("scores", []))]
+        return scores
 
 
 # ============ OUTPUT FORMATTERS ============
+OUTPUT_FORMATS = ("ascii", "markdown", "dict", "json", "msgpack")
+STRUCTURED_FORMATS = ("dict", "json", "msgpack")
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise RuntimeError("msgpack output requires the msgpack package (pip install msgpack)") from None
+    return msgpack
+
+
+def check_output_format(output_format: str):
+    """Raise now if output_format cannot be produced, before anything is generated or persisted."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}. Available: {', '.join(OUTPUT_FORMATS)}")
+    if output_format == "msgpack":
+        _msgpack()
+
+
+def serialize_design_system(design_system: dict, output_format: str = "json"):
+    """Encode the raw design-system dict: "dict" (as is), "json" (str) or "msgpack" (bytes)."""
+    if output_format == "dict":
+        return design_system
+    if output_format == "json":
+        return json.dumps(design_system, ensure_ascii=False)
+    if output_format == "msgpack":
+        return _msgpack().packb(design_system, use_bin_type=True)
+    raise ValueError(f"Unknown structured format: {output_format}. Available: {', '.join(STRUCTURED_FORMATS)}")
+
 BOX_WIDTH = 90  # Wider box for more content
 
 def format_ascii_box(design_system: dict) -> str:
@@ -460,34 +535,149 @@ def format_markdown(design_system: dict) -> str:
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None):
     """
     Main entry point for design system generation.
 
     Args:
         query: Search query (e.g., "SaaS dashboard", "e-commerce luxury")
         project_name: Optional project name for output header
-        output_format: "ascii" (default) or "markdown"
+        output_format: "ascii" (default), "markdown", or one of the structured
+            formats: "dict", "json" or "msgpack" (requires the msgpack package)
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
 
     Returns:
-        Formatted design system string
+        Formatted design system string; the raw dict (with "search_scores") for
+        "dict", a JSON string for "json" and bytes for "msgpack"
     """
+    check_output_format(output_format)
+
     generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    design_system = generator.generate(query, project_name, include_scores=output_format in STRUCTURED_FORMATS)
     
     # Persist to files if requested
     if persist:
         persist_design_system(design_system, page, output_dir, query)
 
+    if output_format in STRUCTURED_FORMATS:
+        return serialize_design_system(design_system, output_format)
     if output_format == "markdown":
         return format_markdown(design_system)
     return format_ascii_box(design_system)
 
 
+# ============ BATCH GENERATION ============
+def _preload():
+    """Build the on-disk index, then load what generation reads."""
+    build_index()
+    _load_worker_state()
+
+
+def _load_worker_state():
+    """Load the indexes and reasoning rules generation reads; writes nothing (pool worker initializer)."""
+    load_indexes(SEARCH_CONFIG)
+    _reasoning_index()
+
+
+def _generate_item(index: int, record: dict, output_dir: str = None) -> dict:
+    """Generate and persist one batch record; never raises."""
+    start = time.perf_counter()
+    item = {"index": index, "query": record.get("query"), "project_name": record.get("project_name"),
+            "page": record.get("page")}
+    try:
+        if not record.get("query"):
+            raise ValueError("record has no query")
+        design_system = DesignSystemGenerator().generate(record["query"], record.get("project_name"))
+        persisted = persist_design_system(design_system, record.get("page"), output_dir,
+                                          record.get("page_query") or record["query"])
+        item.update(status="success", project_name=design_system["project_name"],
+                    files={key: persisted[key] for key in ("created", "updated", "unchanged")})
+    except Exception as e:
+        item.update(status="error", error=f"{type(e).__name__}: {e}")
+    item["seconds"] = round(time.perf_counter() - start, 4)
+    return item
+
+
+def generate_batch(records, output_dir: str = None, workers: int = None) -> dict:
+    """
+    Generate and persist design systems for many briefs in parallel.
+
+    Args:
+        records: Iterable of {"query", "project_name", "page", "page_query"} dicts
+        output_dir: Optional output directory (defaults to current working directory)
+        workers: Process count (default: CPU count); 1 runs in-process
+
+    Returns:
+        Summary report with per-item status, files and timing
+    """
+    records = list(records)
+    output_dir = output_dir or os.getcwd()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(records) or 1))
+    start = time.perf_counter()
+
+    # Preloaded before the pool starts, so forked workers share the indexes copy-on-write
+    _preload()
+    if workers == 1:
+        items = [_generate_item(i, record, output_dir) for i, record in enumerate(records)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_worker_state) as pool:
+            items = list(pool.map(_generate_item, range(len(records)), records, [output_dir] * len(records)))
+
+    timings = sorted(item["seconds"] for item in items)
+    succeeded = sum(1 for item in items if item["status"] == "success")
+    return {
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "workers": workers,
+        "wall_seconds": round(time.perf_counter() - start, 4),
+        "item_seconds": {
+            "sum": round(sum(timings), 4),
+            "p50": timings[len(timings) // 2] if timings else 0,
+            "max": timings[-1] if timings else 0,
+        },
+        "items": items,
+    }
+
+
 # ============ PERSISTENCE FUNCTIONS ============
+_GENERATED_LINE = re.compile(r'^(>\s*)?\*\*Generated:\*\*.*$', re.MULTILINE)
+
+
+def _content_hash(content: str) -> str:
+    """Hash of persisted markdown, ignoring the per-run **Generated:** timestamp line."""
+    return hashlib.sha256(_GENERATED_LINE.sub("", content).encode("utf-8")).hexdigest()
+
+
+def _write_if_changed(path: Path, content: str) -> str:
+    """Atomically write content unless only the timestamp differs; returns created/updated/unchanged."""
+    if path.exists():
+        try:
+            existing = path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            existing = None
+        if existing is not None and _content_hash(existing) == _content_hash(content):
+            return "unchanged"
+        status = "updated"
+    else:
+        status = "created"
+
+    # Per-writer temp name: batch workers and daemon threads may target the same file
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+    return status
+
+
 def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
@@ -498,8 +688,12 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
     
+    Files are only rewritten when their content (ignoring the Generated timestamp)
+    changed, so file watchers are not triggered by identical regenerations.
+
     Returns:
-        dict with created file paths and status
+        dict with status, all persisted file paths ("created_files") and a
+        created/updated/unchanged manifest
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
@@ -511,6 +705,7 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     pages_dir = design_system_dir / "pages"
     
     created_files = []
+    manifest = {"created": [], "updated": [], "unchanged": []}
     
     # Create directories
     design_system_dir.mkdir(parents=True, exist_ok=True)
@@ -520,22 +715,21 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     
     # Generate and write MASTER.md
     master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
+    manifest[_write_if_changed(master_file, master_content)].append(str(master_file))
     created_files.append(str(master_file))
     
     # If page is specified, create page override file with intelligent content
     if page:
         page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
         page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
+        manifest[_write_if_changed(page_file, page_content)].append(str(page_file))
         created_files.append(str(page_file))
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": created_files,
+        **manifest
     }
 
 
@@ -918,7 +1112,6 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
     
     page_lower = page_name.lower()
     query_lower = (page_query or "").lower()
@@ -1059,9 +1252,16 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate Design System")
     parser.add_argument("query", help="Search query (e.g., 'SaaS dashboard')")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name")
-    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format")
+    parser.add_argument("--format", "-f", choices=[f for f in OUTPUT_FORMATS if f != "dict"], default="ascii",
+                        help="Output format (json/msgpack emit the raw dict with search scores)")
 
     args = parser.parse_args()
 
-    result = generate_design_system(args.query, args.project_name, args.format)
-    print(result)
+    try:
+        result = generate_design_system(args.query, args.project_name, args.format)
+    except RuntimeError as e:
+        parser.exit(2, f"error: {e}\n")
+    if isinstance(result, bytes):
+        sys.stdout.buffer.write(result)
+    else:
+        print(result)
@@ -5,6 +5,11 @@ UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --format json|msgpack   (raw dict + per-domain scores)
+       python search.py --batch [--domain <domain> | --stack <stack>] < queries.txt   (one query or JSON object per line)
+       python search.py --design-system --batch [--workers N] [-o <dir>] < briefs.jsonl
+       python search.py --reindex [--changed-only]
+       python search.py --serve [--socket <path>]   (resident daemon; other calls use it when running)
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,11 +17,20 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+
+Batch design systems: each line is {"query", "project_name", "page", "page_query"};
+every brief is generated and persisted in a process pool and a JSON summary is printed.
+
+Index:
+  --reindex       Rebuild every dataset segment in data/.index/ and the merged global statistics
+  --changed-only  Only rebuild segments whose CSV content hash changed
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import sys
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search_many, reindex
+from server import request, serve
 
 
 def format_output(result):
@@ -45,38 +59,99 @@ def format_output(result):
     return "\n".join(output)
 
 
+def read_batch(stream):
+    """Parse newline-delimited queries; lines starting with '{' are JSON objects (an error item if malformed)"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"error": f"Invalid JSON: {e}"}
+            continue
+        yield line
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--exact", action="store_true", help="Disable fuzzy/prefix expansion of unknown query terms")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
-    parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
+    parser.add_argument("--format", "-f", choices=["ascii", "markdown", "json", "msgpack"], default="ascii",
+                        help="Output format for design system (json/msgpack: raw dict with search scores)")
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Batch mode
+    parser.add_argument("--batch", action="store_true", help="Read queries (text or JSONL) from stdin and stream JSONL results")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="With --design-system --batch: worker processes (default: CPU count)")
+    # Daemon mode
+    parser.add_argument("--serve", action="store_true", help="Run a resident search daemon on a Unix domain socket")
+    parser.add_argument("--socket", type=str, default=None, help="Daemon socket path (default: $UIPRO_SOCKET, else in $XDG_RUNTIME_DIR or a private temp dir)")
+    # Index build step
+    parser.add_argument("--reindex", "--build-index", dest="reindex", action="store_true", help="Rebuild the on-disk BM25 index")
+    parser.add_argument("--changed-only", action="store_true", help="With --reindex: only rebuild datasets whose CSV changed")
 
     args = parser.parse_args()
 
+    if args.serve:
+        serve(args.socket)
+    elif args.reindex:
+        for entry in reindex(changed_only=args.changed_only):
+            print(f"{entry['status'].capitalize():<9} {entry['file']}: {entry['docs']} docs, {entry['terms']} terms")
+    elif args.batch and args.design_system:
+        from design_system import generate_batch
+        records = [r if isinstance(r, dict) else {"query": r} for r in read_batch(sys.stdin)]
+        print(json.dumps(generate_batch(records, args.output_dir, args.workers), indent=2, ensure_ascii=False))
+    elif args.batch:
+        for result in search_many(read_batch(sys.stdin), args.domain, args.max_results, fuzzy=not args.exact,
+                                  stack=args.stack):
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+    elif not args.query:
+        parser.error("the following arguments are required: query")
     # Design system takes priority
-    if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
+    elif args.design_system:
+        output_format = "json" if args.json and args.format == "ascii" else args.format
+        structured = output_format in ("json", "msgpack")
+        if structured:
+            from design_system import check_output_format, serialize_design_system
+            try:
+                check_output_format(output_format)  # fail before anything is generated or persisted
+            except RuntimeError as e:
+                parser.exit(2, f"error: {e}\n")
+        try:
+            result = request(
+                "generate_design_system",
+                args.socket,
+                query=args.query,
+                project_name=args.project_name,
+                output_format="dict" if structured else output_format,  # serialized here: the daemon speaks JSON
+                persist=args.persist,
+                page=args.page,
+                output_dir=args.output_dir
+            )
+        except RuntimeError as e:
+            parser.exit(1, f"error: {e}\n")
+        if structured:
+            encoded = serialize_design_system(result, output_format)
+            if isinstance(encoded, bytes):
+                sys.stdout.buffer.write(encoded)
+            else:
+                print(encoded)
+        else:
+            print(result)
         
-        # Print persistence confirmation
-        if args.persist:
+        # Print persistence confirmation (structured output stays machine-readable)
+        if args.persist and not structured:
             project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
@@ -90,17 +165,17 @@ if __name__ == "__main__":
             print("=" * 60)
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+        result = request("search_stack", args.socket, query=args.query, stack=args.stack,
+                         max_results=args.max_results, fuzzy=not args.exact)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = request("search", args.socket, query=args.query, domain=args.domain,
+                         max_results=args.max_results, fuzzy=not args.exact)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Server - keeps BM25 indexes resident behind a Unix domain socket
+
+Protocol (JSON lines): each request is one line
+    {"method": "search", "params": {"query": "saas dashboard", "domain": "product"}}
+and is answered by one line, either {"result": ...} or {"error": "..."}.
+
+Methods: search, search_stack, generate_design_system, cache_stats
+
+Usage:
+    python search.py --serve [--socket /path/to.sock]
+
+    from server import request
+    result = request("search", query="glassmorphism")   # falls back to in-process if no daemon
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+# socketserver and signal are imported by serve(): clients only need socket
+
+_UID = os.getuid() if hasattr(os, "getuid") else None
+# Per-user socket directory: $XDG_RUNTIME_DIR, else a private (0700) directory under the temp dir
+RUNTIME_DIR = (os.environ.get("XDG_RUNTIME_DIR") if os.path.isdir(os.environ.get("XDG_RUNTIME_DIR") or "")
+               else str(Path(tempfile.gettempdir()) / f"uipro-{_UID or 0}"))
+DEFAULT_SOCKET = os.environ.get("UIPRO_SOCKET", str(Path(RUNTIME_DIR) / "uipro-search.sock"))
+CONNECT_TIMEOUT = 0.05
+REQUEST_TIMEOUT = 10.0  # a daemon that takes longer is treated as gone: the request runs in-process
+METHODS = ("search", "search_stack", "generate_design_system", "cache_stats")
+
+
+# ============ DISPATCH ============
+def dispatch(method, params):
+    """Execute a request in this process"""
+    if method == "search":
+        from core import search
+        return search(**params)
+    if method == "search_stack":
+        from core import search_stack
+        return search_stack(**params)
+    if method == "cache_stats":
+        from core import cache_stats
+        return cache_stats()
+    if method == "generate_design_system":
+        from design_system import generate_design_system
+        return generate_design_system(**params)
+    raise ValueError(f"Unknown method: {method}. Available: {', '.join(METHODS)}")
+
+
+# ============ SERVER ============
+def _make_server(socket_path):
+    """Threaded Unix socket server answering one JSON request per line"""
+    import socketserver
+
+    class _RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                    response = {"result": dispatch(message.get("method"), message.get("params") or {})}
+                except Exception as e:
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+    class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    return _Server(socket_path, _RequestHandler)
+
+
+def _owned(path):
+    """True if path exists and belongs to the current user (always True where there are no uids)"""
+    try:
+        return _UID is None or os.stat(path).st_uid == _UID
+    except OSError:
+        return False
+
+
+def _private_dir(directory):
+    """Create the socket directory (0700) if needed; refuse one another user could write to"""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if _UID is not None and directory == RUNTIME_DIR:
+        info = os.stat(directory)
+        if info.st_uid != _UID or info.st_mode & 0o077:
+            raise RuntimeError(f"{directory} must be owned by you with mode 0700")
+
+
+def _is_alive(socket_path):
+    """True if a daemon is accepting connections on socket_path"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def serve(socket_path=None):
+    """Preload every index and answer requests until interrupted"""
+    socket_path = socket_path or DEFAULT_SOCKET
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Unix domain sockets are not supported on this platform")
+    _private_dir(os.path.dirname(os.path.abspath(socket_path)))
+    if os.path.exists(socket_path):
+        if not _owned(socket_path):
+            raise RuntimeError(f"{socket_path} belongs to another user")
+        if _is_alive(socket_path):
+            raise RuntimeError(f"A search daemon is already listening on {socket_path}")
+        os.unlink(socket_path)  # stale socket from a crashed daemon
+
+    import signal
+    from core import build_index
+    import design_system  # noqa: F401 - imported up front so the first request pays nothing
+    build_index()
+
+    server = _make_server(socket_path)
+    os.chmod(socket_path, 0o600)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        print(f"UI Pro Max search daemon listening on {socket_path}", flush=True)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+# ============ CLIENT ============
+def request(method, socket_path=None, **params):
+    """Send a request to the daemon, or run it in-process when no daemon is available"""
+    socket_path = socket_path or DEFAULT_SOCKET
+    persisting = method == "generate_design_system" and params.get("persist")
+    if persisting:
+        # Persist relative to the caller, not the daemon's working directory
+        params["output_dir"] = os.path.abspath(params.get("output_dir") or os.getcwd())
+
+    if hasattr(socket, "AF_UNIX") and _owned(socket_path):  # never trust another user's socket
+        sent = False
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(CONNECT_TIMEOUT)
+                sock.connect(socket_path)
+                sock.settimeout(REQUEST_TIMEOUT)
+                sock.sendall(json.dumps({"method": method, "params": params}).encode("utf-8") + b"\n")
+                sent = True
+                with sock.makefile("rb") as reader:
+                    line = reader.readline()
+            if not line:
+                raise ConnectionError("daemon closed the connection")
+            response = json.loads(line)
+            if "error" in response:
+                raise RuntimeError(response["error"])
+            return response["result"]
+        except (OSError, ValueError) as e:
+            if sent and persisting:
+                # The daemon may still be writing these files; running again here would race it
+                raise RuntimeError(f"search daemon did not confirm the persisted design system: {e}") from e
+            # daemon went away or stalled mid-request: fall through to in-process
+
+    return dispatch(method, params)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Tokenizer - precompiled, memoized tokenization for the BM25 engine
+
+Tokens are lowercase runs of word characters longer than two characters, exactly
+what the original `re.sub(r'[^\\w\\s]', ' ', text).split()` pipeline produced.
+Vocabulary terms are interned (once per distinct term) so postings of every
+dataset share string objects; query tokens are memoized because the same query
+is scored against several datasets.
+
+Usage: python tokenizer.py   (micro-benchmark against the shipped CSVs)
+"""
+
+import re
+import sys
+from functools import lru_cache
+
+# ============ CONFIGURATION ============
+_TOKEN_RE = re.compile(r'\w{3,}')  # == punctuation -> space, split, drop len <= 2
+QUERY_CACHE_SIZE = 4096
+
+STOP_WORDS = frozenset({
+    "and", "are", "but", "for", "from", "has", "have", "into", "its", "not", "that",
+    "the", "their", "then", "there", "these", "this", "use", "using", "was", "were",
+    "when", "which", "while", "with", "without", "you", "your"
+})
+
+
+def light_stem(word):
+    """Strip common English inflections (plurals, -ing, -ed); leaves short words alone"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("ss"):
+        return word
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+# ============ TOKENIZER ============
+class Tokenizer:
+    """Precompiled tokenizer with optional stop words and stemming"""
+
+    def __init__(self, stop_words=None, stem=False, cache_size=QUERY_CACHE_SIZE):
+        self.stop_words = frozenset(stop_words or ())
+        self.stem = stem
+        self.tokenize_query = lru_cache(maxsize=cache_size)(self._tokenize_query)
+
+    def config(self):
+        """Settings that change the token stream (stored with persisted indexes)"""
+        return {"stop_words": sorted(self.stop_words), "stem": self.stem}
+
+    def tokenize(self, text):
+        """Tokenize a document or query"""
+        tokens = _TOKEN_RE.findall(str(text).lower())
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+        if self.stem:
+            tokens = [light_stem(t) for t in tokens]
+        return tokens
+
+    @staticmethod
+    def intern(term):
+        """Canonical string object for a vocabulary term (call once per distinct term)"""
+        return sys.intern(term)
+
+    def _tokenize_query(self, query):
+        """Memoized query tokenization; returns a tuple so cached values stay immutable"""
+        return tuple(self.tokenize(query))
+
+
+# ============ MICRO-BENCHMARK ============
+def _benchmark(repeat=5):
+    """Compare against the original uncompiled pipeline on every shipped CSV"""
+    import csv
+    import time
+    from core import DATA_DIR
+
+    documents = []
+    for filepath in sorted(DATA_DIR.glob("**/*.csv")):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            documents.extend(" ".join(row) for row in csv.reader(f))
+    queries = ["saas dashboard", "glassmorphism dark mode", "elegant luxury serif",
+               "animation accessibility", "fintech crypto", "beauty spa wellness service"] * 50
+
+    def original(text):
+        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+        return [w for w in text.split() if len(w) > 2]
+
+    def timed(fn, items):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in items:
+                fn(item)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    tokenizer = Tokenizer()
+    assert all(original(doc) == tokenizer.tokenize(doc) for doc in documents), "token streams differ"
+
+    rows = [
+        ("documents", len(documents), timed(original, documents), timed(tokenizer.tokenize, documents)),
+        ("queries", len(queries), timed(original, queries), timed(tokenizer.tokenize_query, queries)),
+    ]
+    print(f"{'workload':<10} {'items':>6} {'original ms':>12} {'tokenizer ms':>13} {'speedup':>8}")
+    for name, count, before, after in rows:
+        print(f"{name:<10} {count:>6} {before * 1000:>12.2f} {after * 1000:>13.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Skill: vulnerability-scanner
+Script: bench_security_scan.py
+Purpose: Benchmark security_scan.py pattern matching against the original per-pattern loop
+Usage: python bench_security_scan.py [project_path] [--repeat 5] [--synthetic FILES]
+       python bench_security_scan.py [project_path] --scaling [--jobs 1,2,4,8]
+       python bench_security_scan.py [project_path] --stream [--window 4096]
+Output: Timing table (or JSON with --json)
+
+Compares, on the same file contents (I/O excluded):
+1. legacy  - uncompiled re.findall / re.search per pattern (per line for code patterns)
+2. current - precompiled patterns behind the required-literal prefilter
+and asserts both produce identical findings and that every legacy match
+contains its pattern's required literal. --scaling instead times a
+full scan_files() pass (walk + read + match) for each --jobs value and
+asserts every job count yields the same report. --stream runs the windowed
+large-file scanner with tiny windows and asserts it matches whole-file
+scanning. --synthetic generates a
+throwaway corpus of mostly benign source files with occasional hits.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import security_scan as scan  # noqa: E402
+
+
+# ============================================================================
+#  LEGACY MATCHERS (the original per-pattern loops)
+# ============================================================================
+
+def legacy_secrets(relpath, content):
+    findings = []
+    for pattern, secret_type, severity in scan.SECRET_PATTERNS:
+        matches = re.findall(pattern, content, re.IGNORECASE)
+        if matches:
+            findings.append({"file": relpath, "type": secret_type, "severity": severity, "count": len(matches)})
+    return findings
+
+
+def legacy_code_patterns(relpath, content):
+    findings = []
+    lines = content.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    for line_num, line in enumerate(lines, 1):
+        for pattern, name, severity, category in scan.DANGEROUS_PATTERNS:
+            if re.search(pattern, line, re.IGNORECASE):
+                findings.append({"file": relpath, "line": line_num, "pattern": name, "severity": severity,
+                                 "category": category, "snippet": line.strip()[:80]})
+    return findings
+
+
+def legacy_configuration(relpath, content):
+    findings = []
+    for pattern, issue, severity in scan.CONFIG_ISSUES:
+        if re.search(pattern, content, re.IGNORECASE):
+            findings.append({"file": relpath, "issue": issue, "severity": severity})
+    return findings
+
+
+LEGACY = {"secrets": legacy_secrets, "patterns": legacy_code_patterns, "config": legacy_configuration}
+PATTERN_TABLES = {"secrets": scan.SECRET_PATTERNS, "patterns": scan.DANGEROUS_PATTERNS, "config": scan.CONFIG_ISSUES}
+
+
+def check_literals(kind, items):
+    """
+    Every legacy match of a pattern must contain its prefilter literal, or the prefilter
+    drops findings. Only ASCII content is checked: the prefilter skips the rest.
+    """
+    for pattern, *_ in PATTERN_TABLES[kind]:
+        literal = scan.required_literal(pattern)
+        if not literal:
+            continue
+        for relpath, content in items:
+            if not content.isascii():
+                continue
+            for match in re.finditer(pattern, content, re.IGNORECASE):
+                if literal not in match.group(0).lower():
+                    raise AssertionError(f"{kind}: {pattern!r} matched {match.group(0)!r} in {relpath} "
+                                         f"without its required literal {literal!r}")
+
+
+# ============================================================================
+#  CORPUS
+# ============================================================================
+
+BENIGN_LINES = [
+    "import os", "const value = compute(input);", "def handler(event, context):", "return response.json()",
+    "for (let i = 0; i < items.length; i++) {", "    total += item.price * item.quantity", "}",
+    "export default function App() {", "logger.info('request handled')", "# TODO: refactor",
+    "if user.is_authenticated and user.has_perm('view'):", "const styles = { color: 'red' };",
+]
+RISKY_LINES = [
+    "result = eval(user_input)", "el.innerHTML = html", "api_key = \"sk_live_1234567890abcdef\"",
+    "requests.get(url, verify=False)", "data = pickle.loads(blob)", "password = \"correct-horse\"",
+]
+
+
+def build_synthetic(directory, files, seed=42):
+    """Write `files` source files (about 1 risky line per 200) under directory."""
+    rng = random.Random(seed)
+    exts = [".py", ".js", ".ts", ".tsx", ".json", ".yaml"]
+    for i in range(files):
+        sub = Path(directory) / f"pkg{i % 20}"
+        sub.mkdir(exist_ok=True)
+        lines = [rng.choice(RISKY_LINES) if rng.random() < 0.005 else rng.choice(BENIGN_LINES)
+                 for _ in range(rng.randint(20, 300))]
+        (sub / f"module{i}{rng.choice(exts)}").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def load_corpus(project_path):
+    """[(kinds, relpath, content)] for every file a scanner would read."""
+    corpus = []
+    for filepath, filename, ext in scan.iter_project_files(project_path):
+        kinds = [kind for kind, (wants, _) in scan.FILE_SCANNERS.items() if wants(filename, ext)]
+        if kinds:
+            content = scan.read_text(filepath)
+            if content is not None:
+                corpus.append((kinds, str(filepath.relative_to(project_path)), content))
+    return corpus
+
+
+# ============================================================================
+#  BENCHMARK
+# ============================================================================
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(project_path, repeat):
+    corpus = load_corpus(project_path)
+    report = {"project": project_path, "files": len(corpus),
+              "lines": sum(content.count("\n") for _, _, content in corpus), "scanners": {}}
+
+    for kind, (_, matcher) in scan.FILE_SCANNERS.items():
+        items = [(relpath, content) for kinds, relpath, content in corpus if kind in kinds]
+        legacy = LEGACY[kind]
+        check_literals(kind, items)
+        expected = [f for relpath, content in items for f in legacy(relpath, content)]
+        actual = [f for relpath, content in items for f in matcher(relpath, content)]
+        if kind == "secrets":  # the legacy loop only counted matches; current findings also carry their lines
+            actual = [{k: v for k, v in f.items() if k != "lines"} for f in actual]
+        if expected != actual:
+            raise AssertionError(f"{kind}: findings differ from the legacy loop")
+
+        before = _best(lambda: [legacy(r, c) for r, c in items], repeat)
+        after = _best(lambda: [matcher(r, c) for r, c in items], repeat)
+        report["scanners"][kind] = {"files": len(items), "findings": len(actual),
+                                    "legacy_ms": round(before * 1000, 2), "current_ms": round(after * 1000, 2),
+                                    "speedup": round(before / after, 2) if after else None}
+    return report
+
+
+def bench_scaling(project_path, jobs_list, repeat):
+    """Wall time of scan_files() for each job count; every result must match jobs=1."""
+    kinds = list(scan.FILE_SCANNERS)
+    expected = scan.scan_files(project_path, kinds, 1)
+    report = {"project": project_path, "cpus": os.cpu_count(), "files": len(scan.plan_files(project_path, kinds)),
+              "jobs": {}}
+    for jobs in jobs_list:
+        if scan.scan_files(project_path, kinds, jobs) != expected:
+            raise AssertionError(f"jobs={jobs}: report differs from jobs=1")
+        seconds = _best(lambda: scan.scan_files(project_path, kinds, jobs), repeat)
+        report["jobs"][jobs] = {"seconds": round(seconds, 3)}
+    base = report["jobs"][jobs_list[0]]["seconds"]
+    for r in report["jobs"].values():
+        r["speedup"] = round(base / r["seconds"], 2) if r["seconds"] else None
+    return report
+
+
+def bench_stream(project_path, window, repeat):
+    """stream_file() with STREAM_CHUNK = window must match whole-file scanning on every file."""
+    scan.STREAM_CHUNK, scan.STREAM_OVERLAP = window, max(window // 4, 256)
+    plan = [entry for entry in scan.plan_files(project_path, list(scan.FILE_SCANNERS))
+            if not scan.scan_file(*entry)[2]]  # binary files are never streamed
+    for filepath, relpath, kinds in plan:
+        if scan.stream_file(filepath, relpath, kinds) != scan.scan_file(filepath, relpath, kinds)[1]:
+            raise AssertionError(f"{relpath}: streamed findings differ from whole-file scanning")
+    whole = _best(lambda: [scan.scan_file(f, r, k) for f, r, k in plan], repeat)
+    streamed = _best(lambda: [scan.stream_file(f, r, k) for f, r, k in plan], repeat)
+    return {"project": project_path, "files": len(plan), "window": window,
+            "whole_ms": round(whole * 1000, 2), "streamed_ms": round(streamed * 1000, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark security_scan.py pattern matching")
+    parser.add_argument("project_path", nargs="?", default=".", help="Project directory to benchmark on")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement (best is kept)")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="FILES",
+                        help="Benchmark on a generated corpus of FILES files instead of project_path")
+    parser.add_argument("--scaling", action="store_true", help="Time full scans for each --jobs value")
+    parser.add_argument("--jobs", type=str, default="1,2,4,8", help="Comma-separated job counts for --scaling")
+    parser.add_argument("--stream", action="store_true", help="Check windowed streaming against whole-file scans")
+    parser.add_argument("--window", type=int, default=4096, help="Stream window size in bytes for --stream")
+    parser.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project_path = args.project_path
+        if args.synthetic:
+            build_synthetic(tmp, args.synthetic)
+            project_path = tmp
+        if args.stream:
+            report = bench_stream(project_path, args.window, args.repeat)
+        elif args.scaling:
+            report = bench_scaling(project_path, [int(j) for j in args.jobs.split(",")], args.repeat)
+        else:
+            report = bench(project_path, args.repeat)
+        if args.synthetic:
+            report["project"] = f"<synthetic: {args.synthetic} files>"
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    if args.stream:
+        print(f"Streaming: {report['project']} ({report['files']} files, {report['window']} byte windows) "
+              f"whole {report['whole_ms']:.2f} ms, streamed {report['streamed_ms']:.2f} ms, findings identical")
+        return
+    if args.scaling:
+        print(f"Scan scaling: {report['project']} ({report['files']} files, {report['cpus']} CPUs)")
+        print(f"{'jobs':>5} {'seconds':>9} {'speedup':>8}")
+        for jobs, r in report["jobs"].items():
+            print(f"{jobs:>5} {r['seconds']:>9.3f} {r['speedup']:>7.2f}x")
+        return
+    print(f"Pattern matching: {report['project']} ({report['files']} files, {report['lines']} lines)")
+    print(f"{'scanner':<10} {'files':>7} {'findings':>9} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    for kind, r in report["scanners"].items():
+        print(f"{kind:<10} {r['files']:>7} {r['findings']:>9} {r['legacy_ms']:>10.2f} {r['current_ms']:>11.2f} "
+              f"{r['speedup']:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,10 @@
 Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
-Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
-Output: JSON with validation findings
+Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config] [--jobs N] [--cache [PATH]] [--max-file-size MB]
+       python security_scan.py <project_path> --output jsonl|sarif   (streamed, one finding at a time)
+       python security_scan.py <project_path> --staged | --since <ref>   (only lines changed in git)
+Output: JSON with validation findings (or JSON Lines / SARIF 2.1.0)
 
 This script verifies:
 1. Dependencies - Supply chain security (OWASP A03)
@@ -13,11 +15,14 @@ This script verifies:
 4. Configuration - Security settings validated (OWASP A02)
 """
 import subprocess
+import codecs
+import hashlib
 import json
 import os
 import sys
 import re
 import argparse
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
@@ -85,9 +90,97 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
+def required_literal(pattern: str) -> str:
+    """
+    Lowercase literal that every match of pattern must contain: its leading run of
+    plain characters (e.g. 'child_process.exec' for r'child_process\.exec\s*\(').
+    Empty when the pattern starts with a class/group or has a top-level alternation.
+    """
+    depth, in_class, i = 0, False, 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2                              # escaped character: never structure
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return ""
+        i += 1
+
+    literal, i = [], 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            ch, step = pattern[i + 1], 2       # escaped punctuation is a literal
+        elif ch.isalnum() or ch in "_-\"'/:=<>,;! ":
+            step = 1
+        else:
+            break                               # class, group, anchor, \s, ...
+        following = pattern[i + step:i + step + 1]
+        if following in ("?", "*", "{"):
+            break                               # optional character: not required
+        literal.append(ch)
+        if following == "+":
+            break
+        i += step
+    return "".join(literal).lower()
+
+
+def compile_patterns(patterns: list) -> list:
+    """Precompile a pattern table (regex first in each tuple) into [(literal, compiled, *rest), ...]."""
+    return [(required_literal(pattern), re.compile(pattern, re.IGNORECASE)) + tuple(rest)
+            for pattern, *rest in patterns]
+
+
+def candidate_patterns(compiled: list, content: str):
+    """
+    (patterns that can match content, lowercased content or None). The literal
+    prefilter is only applied to ASCII text, where str.lower() agrees exactly
+    with re.IGNORECASE; other text gets every pattern.
+    """
+    if not content.isascii():
+        return compiled, None
+    lowered = content.lower()
+    return [p for p in compiled if p[0] in lowered], lowered
+
+
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+CONFIG_FILENAMES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+DEFAULT_CACHE_FILE = ".security_scan_cache.sqlite"
+
+# Large files: sniffed for binary content, skipped above the size limit (if any), streamed above the threshold
+SNIFF_BYTES = 8192
+DEFAULT_MAX_FILE_SIZE = 0  # no limit: a secrets scan must not silently drop the largest files
+STREAM_THRESHOLD = 8 * 1024 * 1024
+STREAM_CHUNK = 4 * 1024 * 1024
+STREAM_OVERLAP = 64 * 1024  # longest match guaranteed to be seen whole across a window boundary
+
+CONFIG_ISSUES = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+]
+
+# Cached findings are only reused under the same ruleset; bump SCANNER_VERSION when matcher logic changes
+SCANNER_VERSION = 2
+RULESET_VERSION = hashlib.sha256(json.dumps(
+    [SCANNER_VERSION, SECRET_PATTERNS, DANGEROUS_PATTERNS, CONFIG_ISSUES]).encode("utf-8")).hexdigest()[:16]
+
+SECRET_MATCHER = compile_patterns(SECRET_PATTERNS)
+DANGEROUS_MATCHER = compile_patterns(DANGEROUS_PATTERNS)
+CONFIG_MATCHER = compile_patterns(CONFIG_ISSUES)
 
 
 # ============================================================================
@@ -178,47 +271,561 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+def match_secrets(relpath: str, content: str) -> List[Dict[str, Any]]:
+    """Secret findings for one file (one finding per matching pattern, with its match count and lines)."""
+    findings = []
+    patterns, _ = candidate_patterns(SECRET_MATCHER, content)
+    for _, regex, secret_type, severity in patterns:
+        lines, line, pos = [], 1, 0
+        for match in regex.finditer(content):
+            line += content.count("\n", pos, match.start())
+            pos = match.start()
+            lines.append(line)
+        if lines:
+            findings.append({
+                "file": relpath,
+                "type": secret_type,
+                "severity": severity,
+                "count": len(lines),
+                "lines": lines
+            })
+    return findings
+
+
+def match_code_patterns(relpath: str, content: str, first_line: int = 1) -> List[Dict[str, Any]]:
+    """Dangerous-pattern findings for one file (or a run of its lines), one per matching (line, pattern)."""
+    findings = []
+    patterns, lowered = candidate_patterns(DANGEROUS_MATCHER, content)
+    if not patterns:
+        return findings
+    lines = content.split("\n")
+    if lines[-1] == "":
+        lines.pop()  # trailing newline (or empty file): readlines() yields no extra line
+    lowered_lines = lowered.split("\n") if lowered is not None else lines
+    for line_num, (line, line_lower) in enumerate(zip(lines, lowered_lines), first_line):
+        for literal, regex, name, severity, category in patterns:
+            if (lowered is None or literal in line_lower) and regex.search(line):
+                findings.append({
+                    "file": relpath,
+                    "line": line_num,
+                    "pattern": name,
+                    "severity": severity,
+                    "category": category,
+                    "snippet": line.strip()[:80]
+                })
+    return findings
+
+
+def match_configuration(relpath: str, content: str) -> List[Dict[str, Any]]:
+    """Configuration findings for one file."""
+    findings = []
+    patterns, _ = candidate_patterns(CONFIG_MATCHER, content)
+    for _, regex, issue, severity in patterns:
+        if regex.search(content):
+            findings.append({
+                "file": relpath,
+                "issue": issue,
+                "severity": severity
+            })
+    return findings
+
+
+# Per-file scanners: which files each one reads, and its matcher
+FILE_SCANNERS = {
+    "secrets": (lambda name, ext: ext in CODE_EXTENSIONS or ext in CONFIG_EXTENSIONS, match_secrets),
+    "patterns": (lambda name, ext: ext in CODE_EXTENSIONS, match_code_patterns),
+    "config": (lambda name, ext: ext in CONFIG_EXTENSIONS or name in CONFIG_FILENAMES, match_configuration),
+}
+
+
+class FindingStore:
     """
-    Validate no hardcoded secrets (OWASP A04).
-    Checks: API keys, tokens, passwords, cloud credentials.
+    Every finding of one scanner, kept compactly as tuples over a shared field list
+    (no per-finding dicts). Iterating or indexing rebuilds the finding dicts on
+    demand, leaving out fields a finding does not have.
+    """
+
+    def __init__(self, fields: tuple, findings=()):
+        self.fields = fields
+        self.rows = []
+        self.extend(findings)
+
+    def append(self, finding: Dict[str, Any]):
+        self.rows.append(tuple(finding.get(field) for field in self.fields))
+
+    def extend(self, findings):
+        fields = self.fields
+        self.rows.extend(tuple(finding.get(field) for field in fields) for finding in findings)
+
+    def _finding(self, row: tuple) -> Dict[str, Any]:
+        return {field: value for field, value in zip(self.fields, row) if value is not None}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        if isinstance(other, FindingStore):
+            return self.fields == other.fields and self.rows == other.rows
+        return list(self) == other
+
+    def __iter__(self):
+        return map(self._finding, self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._finding(row) for row in self.rows[index]]
+        return self._finding(self.rows[index])
+
+
+# Field order of each scanner's findings (also the key order of the reported dicts)
+FINDING_FIELDS = {
+    "secrets": ("file", "type", "severity", "count", "lines"),
+    "patterns": ("file", "line", "pattern", "severity", "category", "snippet"),
+    "config": ("file", "issue", "severity", "recommendation"),
+}
+
+
+def iter_project_files(project_path: str):
+    """
+    Walk the project tree once, skipping SKIP_DIRS, in sorted order so findings
+    come out in a stable path/line order. Yields (filepath, filename, extension).
+    """
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+        for file in sorted(files):
+            yield Path(root) / file, file, Path(file).suffix.lower()
+
+
+def read_bytes(filepath) -> bytes:
+    """Raw file content, or None if unreadable."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read()
+    except Exception:
+        return None
+
+
+def is_binary(head: bytes) -> bool:
+    """Binary content sniff (a NUL byte in the first SNIFF_BYTES, as git does)."""
+    return b'\0' in head[:SNIFF_BYTES]
+
+
+def decode_text(data: bytes) -> str:
+    """Decode exactly like text-mode open(encoding='utf-8', errors='ignore'): bad bytes dropped, newlines -> \\n."""
+    return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def iter_windows(filepath):
+    """
+    Stream a file as (window, own, first_line) tuples, decoded like decode_text(), in
+    windows of about STREAM_CHUNK bytes. Matches starting before `own` belong to this
+    window; window[own:] (at least STREAM_OVERLAP chars, cut at a line start unless a
+    line is longer than STREAM_CHUNK) is repeated at the head of the next window, so any match up to
+    STREAM_OVERLAP long is seen whole. first_line is the line number of window[0].
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    carry, pending_cr, first_line = "", "", 1
+    with open(filepath, 'rb') as f:
+        while True:
+            data = f.read(STREAM_CHUNK)
+            text = pending_cr + decoder.decode(data, final=not data)
+            pending_cr = ""
+            if data and text.endswith('\r'):
+                text, pending_cr = text[:-1], '\r'  # might be the first half of \r\n
+            window = carry + text.replace('\r\n', '\n').replace('\r', '\n')
+            if not data:
+                if window:
+                    yield window, len(window), first_line
+                return
+            cut = len(window) - STREAM_OVERLAP
+            own = window.rfind('\n', 0, cut) + 1 if cut > 0 else 0
+            if not own:
+                if cut < STREAM_CHUNK:
+                    carry = window  # keep reading until a line ends before the overlap
+                    continue
+                own = cut  # a line longer than STREAM_CHUNK: split it
+            yield window, own, first_line
+            first_line += window.count('\n', 0, own)
+            carry = window[own:]
+
+
+def stream_file(filepath: str, relpath: str, kinds: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    The per-file scanners over iter_windows(), in bounded memory. Produces the same
+    findings as reading the file whole, as long as no single match is longer than
+    STREAM_OVERLAP and no line is longer than STREAM_CHUNK.
+    """
+    secrets = {}      # regex -> [match lines, end of the last counted match in window coordinates]
+    patterns = []
+    config = set()
+    for window, own, first_line in iter_windows(filepath):
+        if "secrets" in kinds:
+            for _, regex, _, _ in candidate_patterns(SECRET_MATCHER, window)[0]:
+                state = secrets.setdefault(regex, [[], 0])
+                line, pos = first_line, 0
+                for match in regex.finditer(window, state[1]):
+                    if match.start() >= own:
+                        break  # seen whole, and counted, by the next window
+                    line += window.count("\n", pos, match.start())
+                    pos = match.start()
+                    state[0].append(line)
+                    state[1] = match.end()
+            for state in secrets.values():
+                state[1] = max(0, state[1] - own)
+        if "patterns" in kinds:
+            patterns.extend(match_code_patterns(relpath, window[:own], first_line))
+        if "config" in kinds:
+            config.update(regex for _, regex, _, _ in candidate_patterns(CONFIG_MATCHER, window)[0]
+                          if regex not in config and regex.search(window))
+
+    results = {}
+    if "secrets" in kinds:
+        results["secrets"] = [{"file": relpath, "type": secret_type, "severity": severity,
+                               "count": len(secrets[regex][0]), "lines": secrets[regex][0]}
+                              for _, regex, secret_type, severity in SECRET_MATCHER
+                              if regex in secrets and secrets[regex][0]]
+    if "patterns" in kinds:
+        results["patterns"] = patterns
+    if "config" in kinds:
+        results["config"] = [{"file": relpath, "issue": issue, "severity": severity}
+                             for _, regex, issue, severity in CONFIG_MATCHER if regex in config]
+    return results
+
+
+def file_sha256(filepath: str) -> str:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(STREAM_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_text(filepath) -> str:
+    """File content decoded as UTF-8 (undecodable bytes dropped), or None if unreadable."""
+    data = read_bytes(filepath)
+    return decode_text(data) if data is not None else None
+
+
+def iter_changed_files(project_path: str, changes: Dict[str, Any]):
+    """Like iter_project_files(), but only the git-changed files that still exist."""
+    for relpath in sorted(changes):
+        filepath = Path(project_path) / relpath
+        if not SKIP_DIRS.intersection(Path(relpath).parts[:-1]) and filepath.is_file():
+            yield filepath, filepath.name, filepath.suffix.lower()
+
+
+def plan_files(project_path: str, kinds: List[str], changes: Dict[str, Any] = None) -> List[tuple]:
+    """
+    [(filepath, relpath, wanted kinds)] for every file a scanner in kinds reads, in walk
+    order. With changes (see git_changes()), only changed files are planned; no tree walk.
+    """
+    plan = []
+    files = iter_project_files(project_path) if changes is None else iter_changed_files(project_path, changes)
+    for filepath, filename, ext in files:
+        wanted = [kind for kind in kinds if FILE_SCANNERS[kind][0](filename, ext)]
+        if wanted:
+            plan.append((str(filepath), str(filepath.relative_to(project_path)), wanted))
+    return plan
+
+
+def scan_file(filepath: str, relpath: str, kinds: List[str], known_sha256: str = None, hashing: bool = False,
+              max_size: int = DEFAULT_MAX_FILE_SIZE) -> tuple:
+    """
+    Run every scanner in kinds on one file: (sha256, {kind: findings}, skip reason).
+    Files over max_size (0 = no limit) and binary files are skipped with a reason;
+    files over STREAM_THRESHOLD are streamed instead of read whole; unreadable files
+    give {}. sha256 is only computed with hashing, and a file whose hash equals
+    known_sha256 gives None findings without being matched.
+    """
+    try:
+        size = os.path.getsize(filepath)
+        if max_size and size > max_size:
+            return None, {}, "too large"
+        with open(filepath, 'rb') as f:
+            data = f.read() if size <= STREAM_THRESHOLD else None
+            head = data if data is not None else f.read(SNIFF_BYTES)
+        if is_binary(head):
+            return None, {}, "binary"
+        if data is None:
+            sha256 = file_sha256(filepath) if hashing else None
+            if sha256 is not None and sha256 == known_sha256:
+                return sha256, None, None
+            return sha256, stream_file(filepath, relpath, kinds), None
+    except Exception:
+        return None, {}, None
+    sha256 = hashlib.sha256(data).hexdigest() if hashing else None
+    if sha256 is not None and sha256 == known_sha256:
+        return sha256, None, None
+    content = decode_text(data)
+    return sha256, {kind: FILE_SCANNERS[kind][1](relpath, content) for kind in kinds}, None
+
+
+def _scan_chunk(chunk: List[tuple], hashing: bool = False, max_size: int = DEFAULT_MAX_FILE_SIZE) -> List[tuple]:
+    """Worker entry point: scan_file() over a contiguous shard of (filepath, relpath, kinds, known_sha256)."""
+    return [scan_file(*entry, hashing=hashing, max_size=max_size) for entry in chunk]
+
+
+def _run_chunks(entries: List[tuple], jobs: int, hashing: bool, max_size: int) -> List[tuple]:
+    """_scan_chunk() over entries, sharded across `jobs` processes; results keep entry order."""
+    if jobs <= 1 or len(entries) <= 1:
+        return _scan_chunk(entries, hashing, max_size)
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    size = -(-len(entries) // (jobs * 4))  # ~4 shards per worker evens out uneven file sizes
+    chunks = [entries[i:i + size] for i in range(0, len(entries), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [result for chunk in pool.map(partial(_scan_chunk, hashing=hashing, max_size=max_size), chunks) for result in chunk]
+
+
+def scan_files(project_path: str, kinds: List[str], jobs: int = 1, cache=None,
+               changes: Dict[str, Any] = None, max_size: int = DEFAULT_MAX_FILE_SIZE,
+               source: str = None, compact: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the per-file scanners in one pass: walk the tree once, read each file once
+    and hand its content to every scanner in kinds that wants it. With jobs > 1 the
+    file list is sharded across a process pool; shards are merged back in plan
+    order, so the report is identical for any jobs value. With a FindingsCache,
+    unchanged files reuse their stored findings instead of being matched again.
+    With changes, only changed files are scanned and findings outside the changed
+    lines are dropped. Binary files and files over max_size are listed under
+    "skipped_files" instead of being scanned. With source (a staged_snapshot()),
+    the changed files are read from there; the cache still keys them by their
+    path under project_path. Findings are lists of dicts, or with compact the
+    FindingStore they were collected in (iterate it; see write_jsonl()).
+    Returns {kind: scanner result} for kinds out of "secrets", "patterns", "config".
+    """
+    plan = plan_files(source or project_path, kinds, changes) if kinds else []
+    cache_keys = [os.path.join(project_path, relpath) if source else filepath for filepath, relpath, _ in plan]
+    per_file = [None] * len(plan)
+    pending = []  # (plan index, content hash the cache knows for that file)
+    for i, (filepath, relpath, wanted) in enumerate(plan):
+        cached, known_sha256 = (cache.lookup(cache_keys[i], relpath, wanted, filepath) if cache is not None
+                                else (None, None))
+        if cached is not None:
+            per_file[i] = cached
+        else:
+            pending.append((i, known_sha256))
+
+    skipped = {}
+    scanned_entries = _run_chunks([plan[i] + (known,) for i, known in pending], jobs, cache is not None, max_size)
+    for (i, _), (sha256, result, skip_reason) in zip(pending, scanned_entries):
+        filepath, relpath, wanted = plan[i]
+        if skip_reason:
+            skipped[i] = skip_reason
+        elif result is None:
+            result = cache.refresh(cache_keys[i], wanted)       # touched but unchanged
+        elif cache is not None and sha256 is not None:
+            cache.store(cache_keys[i], relpath, sha256, result)
+        per_file[i] = result
+
+    findings = {kind: FindingStore(FINDING_FIELDS[kind]) for kind in kinds}
+    scanned = {kind: 0 for kind in kinds}
+    skipped_files = {kind: [] for kind in kinds}
+    for i, ((_, relpath, wanted), result) in enumerate(zip(plan, per_file)):
+        for kind in wanted:
+            if i in skipped:
+                skipped_files[kind].append({"file": relpath, "reason": skipped[i]})
+                continue
+            scanned[kind] += 1
+            file_findings = result.get(kind, ())
+            if changes is not None:
+                file_findings = filter_changed_lines(file_findings, changes[relpath])
+            findings[kind].extend(file_findings)
+
+    if not compact:
+        findings = {kind: list(store) for kind, store in findings.items()}
+    summarize = {"secrets": _secrets_result, "patterns": _code_patterns_result,
+                 "config": lambda *args: _configuration_result(*args, project_checks=changes is None)}
+    results = {kind: summarize[kind](project_path, findings[kind], scanned[kind]) for kind in kinds}
+    for kind in kinds:
+        if skipped_files[kind]:
+            results[kind]["skipped_files"] = skipped_files[kind]
+    return results
+
+
+# ============================================================================
+#  GIT DIFF SCOPE
+# ============================================================================
+
+# Dependency checks only run in diff mode when one of these changed
+DEPENDENCY_FILES = {'package.json', 'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml',
+                    'requirements.txt', 'Pipfile.lock', 'poetry.lock', 'setup.py'}
+_HUNK_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def _git(project_path: str, *args: str, input: str = None) -> str:
+    try:
+        result = subprocess.run(["git", "-C", project_path, "-c", "core.quotePath=false", *args], input=input,
+                                capture_output=True, text=True, encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        raise RuntimeError("git is not installed")
+    if result.returncode != 0:
+        message = result.stderr.strip().splitlines()
+        raise RuntimeError(f"git {args[0]} failed: {message[0] if message else result.returncode}")
+    return result.stdout
+
+
+def _diff_path(header: str) -> str:
+    """Path from a '+++ b/<path>' header: C-quoted names are unescaped, a trailing tab dropped."""
+    if header.startswith('"'):
+        # core.quotePath=false leaves UTF-8 as is; only \", \\, \t, \n and octal escapes remain
+        return codecs.escape_decode(header[1:header.rindex('"')].encode('utf-8'))[0].decode('utf-8', errors='replace')
+    return header[:-1] if header.endswith('\t') else header
+
+
+def git_changes(project_path: str, since: str = None, staged: bool = False) -> Dict[str, Any]:
+    """
+    Files changed in git under project_path: {relpath: set of added/modified line
+    numbers, or None for every line}. staged diffs the index against HEAD (scan the
+    staged content, see staged_snapshot()); since diffs the working tree against
+    that ref and adds untracked files. Deleted files are left out.
+    """
+    _git(project_path, "rev-parse", "--git-dir")  # clear error outside a repository
+    # Explicit prefixes: diff.noprefix / diff.mnemonicPrefix would otherwise change the +++ header
+    args = ["diff", "-U0", "--no-color", "--no-ext-diff", "--relative", "--diff-filter=ACMR",
+            "--src-prefix=a/", "--dst-prefix=b/"]
+    args += ["--cached"] if staged else [since]
+    changes = {}
+    current = None
+    for line in _git(project_path, *args, "--").splitlines():
+        if line.startswith("+++ "):
+            path = _diff_path(line[4:])
+            current = str(Path(path[2:])) if path.startswith("b/") else None
+            if current is not None:
+                changes.setdefault(current, set())
+        elif current is not None and line.startswith("@@"):
+            hunk = _HUNK_RE.match(line)
+            if hunk:
+                start, length = int(hunk.group(1)), int(hunk.group(2) or 1)
+                changes[current].update(range(start, start + length))
+    if not staged:
+        for path in _git(project_path, "ls-files", "--others", "--exclude-standard", "-z").split("\0"):
+            if path:
+                changes[str(Path(path))] = None
+    return changes
+
+
+def staged_snapshot(project_path: str, changes: Dict[str, Any], directory: str) -> str:
+    """
+    Check the staged (index) content of the changed files out under directory, so a
+    --staged scan sees what will be committed rather than the working tree. Returns
+    the snapshot's equivalent of project_path.
+    """
+    prefix = _git(project_path, "rev-parse", "--show-prefix").strip()
+    if changes:
+        _git(project_path, "checkout-index", "-z", "--stdin", f"--prefix={os.path.join(directory, '')}",
+             input="".join(Path(relpath).as_posix() + "\0" for relpath in changes))
+    return os.path.join(directory, prefix)
+
+
+def filter_changed_lines(findings: List[Dict[str, Any]], lines) -> List[Dict[str, Any]]:
+    """
+    Findings that touch the changed lines (lines=None keeps all). Secret findings are
+    narrowed to their matches on changed lines; line-less findings are kept as is.
+    """
+    if lines is None:
+        return list(findings)
+    kept = []
+    for finding in findings:
+        if "lines" in finding:
+            hits = [n for n in finding["lines"] if n in lines]
+            if hits:
+                kept.append(dict(finding, count=len(hits), lines=hits))
+        elif "line" not in finding or finding["line"] in lines:
+            kept.append(finding)
+    return kept
+
+
+# ============================================================================
+#  FINDINGS CACHE
+# ============================================================================
+
+class FindingsCache:
     """
+    Per-file findings in SQLite, keyed by file path + content hash + RULESET_VERSION.
+    A file whose mtime and size are unchanged is a hit without being read; otherwise
+    it is re-read and hashed, and only re-matched if its content actually changed.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, relpath TEXT, mtime_ns INTEGER, "
+                        "size INTEGER, sha256 TEXT, ruleset TEXT, findings TEXT)")
+        self.db.execute("DELETE FROM files WHERE ruleset != ?", (RULESET_VERSION,))
+        self.rows = {row[0]: row[1:] for row in
+                     self.db.execute("SELECT path, relpath, mtime_ns, size, sha256, findings FROM files")}
+        self.stats = {"stat_hits": 0, "hash_hits": 0, "misses": 0}
+        self._stat = {}
+
+    def lookup(self, filepath: str, relpath: str, kinds: List[str], source: str = None):
+        """
+        (cached findings or None, content hash known for the file or None). source is
+        the file actually read when it is not filepath (a staged snapshot); its
+        mtime/size are what gets compared and recorded.
+        """
+        key = os.path.abspath(filepath)
+        try:
+            st = os.stat(source or key)
+            self._stat[key] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            self._stat[key] = None
+        row = self.rows.get(key)
+        if row is None or row[0] != relpath:
+            return None, None
+        stored_relpath, mtime_ns, size, sha256, findings = row
+        findings = json.loads(findings)
+        if not all(kind in findings for kind in kinds):
+            return None, None
+        if self._stat[key] == (mtime_ns, size):
+            self.stats["stat_hits"] += 1
+            return findings, sha256
+        return None, sha256
+
+    def refresh(self, filepath: str, kinds: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Cached findings of a file whose content hash matched; records its new mtime/size."""
+        key = os.path.abspath(filepath)
+        relpath, _, _, sha256, findings = self.rows[key]
+        self.stats["hash_hits"] += 1
+        self._write(key, relpath, sha256, findings)
+        return json.loads(findings)
+
+    def store(self, filepath: str, relpath: str, sha256: str, findings: Dict[str, List[Dict[str, Any]]]):
+        key = os.path.abspath(filepath)
+        self.stats["misses"] += 1
+        row = self.rows.get(key)
+        if row is not None and row[0] == relpath and row[3] == sha256:
+            findings = dict(json.loads(row[4]), **findings)  # keep kinds scanned by earlier runs
+        self._write(key, relpath, sha256, json.dumps(findings))
+
+    def _write(self, key: str, relpath: str, sha256: str, findings: str):
+        mtime_ns, size = self._stat.get(key) or (None, None)
+        self.rows[key] = (relpath, mtime_ns, size, sha256, findings)
+        self.db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, relpath, mtime_ns, size, sha256, RULESET_VERSION, findings))
+
+    def report(self) -> Dict[str, Any]:
+        lookups = sum(self.stats.values())
+        hits = self.stats["stat_hits"] + self.stats["hash_hits"]
+        return dict(self.stats, path=self.path, files=lookups,
+                    hit_rate=round(hits / lookups, 4) if lookups else 0.0)
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+def _secrets_result(project_path: str, findings: List[Dict[str, Any]], scanned_files: int) -> Dict[str, Any]:
     results = {
         "tool": "secret_scanner",
-        "findings": [],
+        "findings": findings,
         "status": "[OK] No secrets detected",
-        "scanned_files": 0,
+        "scanned_files": scanned_files,
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+    for finding in findings:
+        results["by_severity"][finding["severity"]] += finding["count"]
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -227,55 +834,19 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     elif sum(results["by_severity"].values()) > 0:
         results["status"] = "[?] Potential secrets detected"
     
-    # Limit findings for output
-    results["findings"] = results["findings"][:15]
-    
     return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
-    """
-    Validate dangerous code patterns (OWASP A05).
-    Checks: Injection risks, XSS, unsafe deserialization.
-    """
+def _code_patterns_result(project_path: str, findings: List[Dict[str, Any]], scanned_files: int) -> Dict[str, Any]:
     results = {
         "tool": "pattern_scanner",
-        "findings": [],
+        "findings": findings,
         "status": "[OK] No dangerous patterns",
-        "scanned_files": 0,
+        "scanned_files": scanned_files,
         "by_category": {}
     }
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+    for finding in findings:
+        results["by_category"][finding["category"]] = results["by_category"].get(finding["category"], 0) + 1
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -287,73 +858,33 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     elif results["findings"]:
         results["status"] = "[?] Some patterns need review"
     
-    # Limit findings
-    results["findings"] = results["findings"][:20]
-    
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
-    """
-    Validate security configuration (OWASP A02).
-    Checks: Security headers, CORS, debug modes.
-    """
+def _configuration_result(project_path: str, findings: List[Dict[str, Any]], scanned_files: int,
+                          project_checks: bool = True) -> Dict[str, Any]:
     results = {
         "tool": "config_scanner",
-        "findings": [],
+        "findings": findings,
         "status": "[OK] Configuration secure",
         "checks": {}
     }
     
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
-    
-    # Check for security header configurations
+    # Check for security header configurations (project-wide, so skipped by diff-scoped scans)
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
-    for hf in header_files:
-        hf_path = Path(project_path) / hf
-        if hf_path.exists():
-            results["checks"]["security_headers_config"] = True
-            break
-    else:
-        results["checks"]["security_headers_config"] = False
-        results["findings"].append({
-            "issue": "No security headers configuration found",
-            "severity": "medium",
-            "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
-        })
+    if project_checks:
+        for hf in header_files:
+            hf_path = Path(project_path) / hf
+            if hf_path.exists():
+                results["checks"]["security_headers_config"] = True
+                break
+        else:
+            results["checks"]["security_headers_config"] = False
+            results["findings"].append({
+                "issue": "No security headers configuration found",
+                "severity": "medium",
+                "recommendation": "Configure CSP, HSTS, X-Frame-Options headers"
+            })
     
     if any(f["severity"] == "critical" for f in results["findings"]):
         results["status"] = "[!!] CRITICAL: Configuration issues"
@@ -365,12 +896,128 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
     return results
 
 
+def scan_secrets(project_path: str) -> Dict[str, Any]:
+    """
+    Validate no hardcoded secrets (OWASP A04).
+    Checks: API keys, tokens, passwords, cloud credentials.
+    """
+    return scan_files(project_path, ["secrets"])["secrets"]
+
+
+def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+    """
+    Validate dangerous code patterns (OWASP A05).
+    Checks: Injection risks, XSS, unsafe deserialization.
+    """
+    return scan_files(project_path, ["patterns"])["patterns"]
+
+
+def scan_configuration(project_path: str) -> Dict[str, Any]:
+    """
+    Validate security configuration (OWASP A02).
+    Checks: Security headers, CORS, debug modes.
+    """
+    return scan_files(project_path, ["config"])["config"]
+
+
+# ============================================================================
+#  REPORT OUTPUT
+# ============================================================================
+
+SARIF_LEVELS = {"critical": "error", "high": "error", "medium": "warning"}
+# Scan name -> the finding field that names what was found
+FINDING_LABELS = {"dependencies": "type", "secrets": "type", "code_patterns": "pattern", "configuration": "issue"}
+
+
+def report_metadata(report: Dict[str, Any]) -> Dict[str, Any]:
+    """The report without its findings (summary, statuses, counts)."""
+    meta = dict(report)
+    meta["scans"] = {name: {key: value for key, value in result.items() if key != "findings"}
+                     for name, result in report["scans"].items()}
+    return meta
+
+
+def write_jsonl(report: Dict[str, Any], out):
+    """One JSON line per finding (tagged with its scan), then one line of report metadata."""
+    for name, result in report["scans"].items():
+        for finding in result.get("findings", []):
+            out.write(json.dumps(dict(scan=name, **finding)) + "\n")
+    out.write(json.dumps(report_metadata(report)) + "\n")
+
+
+def _sarif_rule_id(name: str, finding: Dict[str, Any]) -> str:
+    label = str(finding.get(FINDING_LABELS.get(name, ""), "finding"))
+    return f"{name}/{re.sub(r'[^a-z0-9]+', '-', label.lower()).strip('-')}"
+
+
+def _sarif_results(name: str, finding: Dict[str, Any]):
+    label = finding.get(FINDING_LABELS.get(name, ""), name)
+    if name == "code_patterns":
+        text = f"{label} ({finding['category']}): {finding['snippet']}"
+    elif name == "secrets":
+        text = f"Possible {label}"
+    else:
+        text = f"{label}: {finding['recommendation']}" if "recommendation" in finding else finding.get("message", label)
+    result = {"ruleId": _sarif_rule_id(name, finding), "level": SARIF_LEVELS.get(finding.get("severity"), "note"),
+              "message": {"text": text}}
+    if "file" not in finding:
+        yield result
+        return
+    uri = Path(finding["file"]).as_posix()
+    for line in finding.get("lines") or [finding.get("line")]:
+        location = {"artifactLocation": {"uri": uri}}
+        if line:
+            location["region"] = {"startLine": line}
+        yield dict(result, locations=[{"physicalLocation": location}])
+
+
+def write_sarif(report: Dict[str, Any], out):
+    """
+    SARIF 2.1.0 log for CI code-scanning upload, written result by result. Secret
+    findings give one result per matching line.
+    """
+    rules = {}
+    for name, result in report["scans"].items():
+        for finding in result.get("findings", []):
+            rule_id = _sarif_rule_id(name, finding)
+            if rule_id not in rules:
+                rules[rule_id] = {
+                    "id": rule_id,
+                    "shortDescription": {"text": str(finding.get(FINDING_LABELS.get(name, ""), name))},
+                    "defaultConfiguration": {"level": SARIF_LEVELS.get(finding.get("severity"), "note")},
+                }
+    driver = {"name": "security_scan", "rules": list(rules.values())}
+    out.write('{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", "runs": [{')
+    out.write(f'"tool": {json.dumps({"driver": driver})}, "results": [')
+    first = True
+    for name, result in report["scans"].items():
+        for finding in result.get("findings", []):
+            for sarif_result in _sarif_results(name, finding):
+                out.write(("\n" if first else ",\n") + json.dumps(sarif_result))
+                first = False
+    out.write(f'\n], "properties": {json.dumps(report_metadata(report))}}}]}}\n')
+
+
 # ============================================================================
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all", jobs: int = 1, cache_path: str = None,
+                  since: str = None, staged: bool = False, max_size: int = DEFAULT_MAX_FILE_SIZE,
+                  compact: bool = False) -> Dict[str, Any]:
+    """
+    Execute security validation scans (file scanners sharded across `jobs` processes).
+    With cache_path, per-file findings are reused from that SQLite cache when files are
+    unchanged, and the report gains a "cache" section with hit rates.
+    With since/staged, only the lines changed in git are scanned (see git_changes());
+    staged scans read the index content, not the working tree.
+    Files over max_size bytes (0 = no limit) are skipped; large ones are streamed.
+    Skipped (binary or oversized) files are counted in the summary and make an
+    otherwise clean scan "[?] REVIEW RECOMMENDED", since they were never read.
+    With compact, file scanner findings stay in FindingStores for write_jsonl() and
+    write_sarif() instead of being expanded into lists.
+    """
+    changes = git_changes(project_path, since, staged) if since or staged else None
     
     report = {
         "project": project_path,
@@ -381,6 +1028,7 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
             "total_findings": 0,
             "critical": 0,
             "high": 0,
+            "skipped_files": 0,
             "overall_status": "[OK] SECURE"
         }
     }
@@ -392,10 +1040,32 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         "config": ("configuration", scan_configuration),
     }
     
+    # Secrets, code patterns and configuration share one walk and one read per file
+    cache = FindingsCache(cache_path) if cache_path else None
+    snapshot = tempfile.TemporaryDirectory(prefix="security-scan-") if staged else None
+    try:
+        source = staged_snapshot(project_path, changes, snapshot.name) if staged else None
+        file_results = scan_files(project_path, [key for key in FILE_SCANNERS if scan_type in ("all", key)],
+                                  jobs, cache, changes, max_size, source, compact)
+    finally:
+        if cache is not None:
+            cache.close()
+        if snapshot is not None:
+            snapshot.cleanup()
+    if cache is not None:
+        report["cache"] = cache.report()
+    if changes is not None:
+        report["diff"] = {"base": "staged" if staged else since, "changed_files": len(changes)}
+        if not DEPENDENCY_FILES.intersection(Path(path).name for path in changes):
+            scanners["deps"] = ("dependencies", lambda _: {
+                "tool": "dependency_scanner", "findings": [], "status": "[OK] Skipped: no dependency files changed"})
+    
+    skipped = set()
     for key, (name, scanner) in scanners.items():
         if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
+            result = file_results[key] if key in file_results else scanner(project_path)
             report["scans"][name] = result
+            skipped.update(entry["file"] for entry in result.get("skipped_files", []))
             
             findings_count = len(result.get("findings", []))
             report["summary"]["total_findings"] += findings_count
@@ -407,12 +1077,14 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
                 elif sev == "high":
                     report["summary"]["high"] += 1
     
+    report["summary"]["skipped_files"] = len(skipped)
+    
     # Determine overall status
     if report["summary"]["critical"] > 0:
         report["summary"]["overall_status"] = "[!!] CRITICAL ISSUES FOUND"
     elif report["summary"]["high"] > 0:
         report["summary"]["overall_status"] = "[!] HIGH RISK ISSUES"
-    elif report["summary"]["total_findings"] > 0:
+    elif report["summary"]["total_findings"] > 0 or skipped:
         report["summary"]["overall_status"] = "[?] REVIEW RECOMMENDED"
     
     return report
@@ -425,16 +1097,40 @@ def main():
     parser.add_argument("project_path", nargs="?", default=".", help="Project directory to scan")
     parser.add_argument("--scan-type", choices=["all", "deps", "secrets", "patterns", "config"],
                         default="all", help="Type of scan to run")
-    parser.add_argument("--output", choices=["json", "summary"], default="json",
-                        help="Output format")
+    parser.add_argument("--output", choices=["json", "summary", "jsonl", "sarif"], default="json",
+                        help="Output format (jsonl and sarif stream findings one at a time)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes for file scanning (0 = one per CPU, default: 1)")
+    
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_FILE, default=None, metavar="PATH",
+                        help=f"Reuse findings for unchanged files from a SQLite cache "
+                             f"(default PATH: <project>/{DEFAULT_CACHE_FILE})")
+    
+    parser.add_argument("--max-file-size", type=float, default=DEFAULT_MAX_FILE_SIZE / (1024 * 1024), metavar="MB",
+                        help="Skip larger files; skips are counted in the summary (default: 0 = no limit). "
+                             f"Files over {STREAM_THRESHOLD // (1024 * 1024)} MB are streamed in bounded memory")
+    scope = parser.add_mutually_exclusive_group()
+    scope.add_argument("--staged", action="store_true",
+                       help="Only scan lines staged in git (pre-commit hooks)")
+    scope.add_argument("--since", metavar="REF",
+                       help="Only scan lines changed since a git ref, plus untracked files")
     
     args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    cache_path = args.cache
+    if cache_path == DEFAULT_CACHE_FILE:
+        cache_path = os.path.join(args.project_path, DEFAULT_CACHE_FILE)
     
     if not os.path.isdir(args.project_path):
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    try:
+        result = run_full_scan(args.project_path, args.scan_type, jobs, cache_path, args.since, args.staged,
+                               int(args.max_file_size * 1024 * 1024), compact=args.output in ("jsonl", "sarif"))
+    except RuntimeError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
     
     if args.output == "summary":
         print(f"\n{'='*60}")
@@ -444,12 +1140,26 @@ def main():
         print(f"Total Findings: {result['summary']['total_findings']}")
         print(f"  Critical: {result['summary']['critical']}")
         print(f"  High: {result['summary']['high']}")
+        if result['summary']['skipped_files']:
+            print(f"Skipped: {result['summary']['skipped_files']} binary or oversized files (not scanned)")
+        if "diff" in result:
+            print(f"Scope: {result['diff']['changed_files']} files changed ({result['diff']['base']})")
+        if "cache" in result:
+            cache = result["cache"]
+            print(f"Cache: {cache['hit_rate']:.0%} hits ({cache['stat_hits']} unchanged, "
+                  f"{cache['hash_hits']} touched, {cache['misses']} rescanned)")
         print(f"{'='*60}\n")
         
         for scan_name, scan_result in result['scans'].items():
             print(f"\n{scan_name.upper()}: {scan_result['status']}")
+            if scan_result.get('skipped_files'):
+                print(f"  ({len(scan_result['skipped_files'])} binary or oversized files skipped)")
             for finding in scan_result.get('findings', [])[:5]:
                 print(f"  - {finding}")
+    elif args.output == "jsonl":
+        write_jsonl(result, sys.stdout)
+    elif args.output == "sarif":
+        write_sarif(result, sys.stdout)
     else:
         print(json.dumps(result, indent=2))
 